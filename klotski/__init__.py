@@ -0,0 +1 @@
+# Pygame-free solver core for the Klotski scripts.
@@ -0,0 +1,6 @@
+# python -m klotski, same as the klotski-solve command
+import sys
+
+from klotski.cli import main
+
+sys.exit(main())
@@ -0,0 +1,205 @@
+# klotski-batch: solves many start configurations across a pool of worker processes.
+#
+# Input is JSON lines or CSV, one configuration per line:
+#   {"id": "a", "variant": "standard"}
+#   {"id": "b", "layout": [[1, 0, 2, 2], [0, 0, 1, 2], ...], "algorithm": "bfs"}
+#   id,variant,layout,algorithm            (CSV header, layout as "col row width height" blocks joined by ";")
+# Every job is solved on its own in a worker and its result is written as soon as it finishes, so the output is in
+# completion order and each row carries the id of its configuration. A configuration that cannot be read or solved
+# as given (unknown variant, a field that is not an int, a target off the board, ...) gets a row with error set.
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from klotski.distance_table import load_distance_table
+from klotski.layouts import COLS, LAYOUTS, ROWS, TARGET, check_layout, is_int, make_board
+from klotski.metrics import Metrics
+from klotski.pattern_db import load_pattern_db
+from klotski.solution_cache import SolutionCache
+from klotski.solvers import ALGORITHMS, measured_solve
+from klotski.storage import board_signature
+
+RESULT_FIELDS = ["id", "algorithm", "moves", "expanded", "seconds", "peak_mb", "error"]
+
+_heuristics = {} #board signature -> pattern database heuristic, loaded once per worker process
+_cache = None #SolutionCache of this worker process, opened by the first job that uses it
+
+
+def parse_layout(text):
+    #"1 0 2 2;0 0 1 2;..." -> [(1, 0, 2, 2), (0, 0, 1, 2), ...]
+    return [tuple(int(value) for value in block.split()) for block in text.split(";") if block.strip()]
+
+
+def csv_row(row):
+    #a CSV row with the types of a JSON configuration: the layout as blocks, cols and rows as ints, target "col row"
+    row = dict(row)
+    if row.get("layout"):
+        row["layout"] = parse_layout(row["layout"])
+    for field in ("cols", "rows"):
+        if row.get(field):
+            row[field] = int(row[field])
+    if row.get("target"):
+        row["target"] = [int(value) for value in row["target"].split()]
+    return row
+
+
+def parse_job(row, number, algorithm):
+    #the job of one configuration, a JSON object or a CSV row. Raises ValueError when it cannot be solved as given
+    if not isinstance(row, dict):
+        raise ValueError(f"a configuration is a JSON object, not {row!r}")
+    variant = row.get("variant") or "standard"
+    layout = row.get("layout")
+    if not layout:
+        if variant not in LAYOUTS:
+            raise ValueError(f"unknown variant {variant!r}, expected one of {', '.join(sorted(LAYOUTS))}")
+        layout = LAYOUTS[variant]
+    if not isinstance(layout, list):
+        raise ValueError(f"layout {layout!r} is not a list of blocks")
+    job_algorithm = row.get("algorithm") or algorithm
+    if job_algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {job_algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
+    cols, rows, target = row.get("cols") or COLS, row.get("rows") or ROWS, row.get("target") or TARGET
+    for name, value in (("cols", cols), ("rows", rows)):
+        if not is_int(value) or value < 1:
+            raise ValueError(f"{name} {value!r} is not a positive int")
+    check_layout(layout, cols, rows, target)
+    return {
+        "id": str(row.get("id") or number),
+        "layout": [tuple(block) for block in layout],
+        "algorithm": job_algorithm,
+        "cols": cols,
+        "rows": rows,
+        "target": tuple(target),
+    }
+
+
+def read_jobs(path, algorithm="astar"):
+    #yields one job dict per configuration in a .csv or JSON lines file, algorithm is the default for jobs without one.
+    #Every configuration is checked as it is read, one that fails yields a job with only id, algorithm and error
+    with open(path, newline="") as file:
+        if path.endswith(".csv"):
+            rows = csv.DictReader(file)
+        else:
+            rows = (line for line in file if line.strip())
+        for number, row in enumerate(rows, 1):
+            try:
+                row = csv_row(row) if isinstance(row, dict) else json.loads(row)
+                job = parse_job(row, number, algorithm)
+            except Exception as error: #a bad configuration is a row of the output, not the end of the batch
+                named = row if isinstance(row, dict) else {}
+                job = {"id": str(named.get("id") or number), "algorithm": named.get("algorithm") or algorithm,
+                       "error": str(error)}
+            yield job
+
+
+def prepare(board, algorithm):
+    #builds the on-disk tables a job needs, called in the parent so the workers never build the same table at once
+    if algorithm in ("astar", "ida", "hda"):
+        load_pattern_db(board)
+    elif algorithm == "table":
+        load_distance_table(board).close()
+
+
+def heuristic_for(board, algorithm):
+    if algorithm not in ("astar", "ida"):
+        return None
+    signature = board_signature(board)
+    if signature not in _heuristics:
+        _heuristics[signature] = load_pattern_db(board).heuristic
+    return _heuristics[signature]
+
+
+def cache_for(use_cache):
+    #one SolutionCache per worker process, they share the sqlite file
+    global _cache
+    if use_cache and _cache is None:
+        _cache = SolutionCache()
+    return _cache if use_cache else None
+
+
+def solve_job(job, symmetry=False, trace_memory=True, use_cache=False):
+    #runs in a worker process, returns one result row. A bad configuration gives a row with error set.
+    #With use_cache a position solved before (by any job or run) is answered from the solution cache, expanded 0
+    result = dict.fromkeys(RESULT_FIELDS)
+    result["id"] = job["id"]
+    result["algorithm"] = job["algorithm"]
+    if job.get("error") is not None: #found while reading the configuration
+        result["error"] = job["error"]
+        return result
+    try:
+        check_layout(job["layout"], job["cols"], job["rows"], job["target"])
+        board, initial_state = make_board(job["layout"], job["cols"], job["rows"], job["target"])
+        heuristic = heuristic_for(board, job["algorithm"])
+        metrics = Metrics()
+        solution, seconds, peak = measured_solve(board, initial_state, job["algorithm"], symmetry=symmetry,
+                                                 heuristic=heuristic, metrics=metrics, trace_memory=trace_memory,
+                                                 cache=cache_for(use_cache))
+    except Exception as error: #one job failing never takes the others down
+        result["error"] = str(error) or type(error).__name__
+        return result
+    result["moves"] = len(solution) if solution is not None else None
+    result["expanded"] = metrics.expanded
+    result["seconds"] = round(seconds, 6)
+    result["peak_mb"] = round(peak / 1024 / 1024, 4) if trace_memory else None
+    if solution is None:
+        result["error"] = "no solution"
+    return result
+
+
+def run_batch(jobs, output, workers=None, symmetry=False, trace_memory=True, use_cache=False):
+    #solves jobs on workers processes (default: one per core) and streams a row per finished job to output,
+    #a .csv path gives CSV and anything else JSON lines. Returns the number of jobs that failed
+    jobs = list(jobs)
+    prepared = set()
+    for job in jobs:
+        if job.get("error") is not None:
+            continue
+        try:
+            check_layout(job["layout"], job["cols"], job["rows"], job["target"])
+            board, _ = make_board(job["layout"], job["cols"], job["rows"], job["target"])
+            if (board_signature(board), job["algorithm"]) not in prepared:
+                prepare(board, job["algorithm"])
+                prepared.add((board_signature(board), job["algorithm"]))
+        except Exception:
+            continue #reported by the worker
+
+    failed = 0
+    with open(output, "w", newline="") as file, ProcessPoolExecutor(max_workers=workers) as pool:
+        writer = None
+        if output.endswith(".csv"):
+            writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+        futures = [pool.submit(solve_job, job, symmetry, trace_memory, use_cache) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            if result["error"] is not None:
+                failed += 1
+            if writer is not None:
+                writer.writerow(result)
+            else:
+                file.write(json.dumps(result) + "\n")
+            file.flush()
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="klotski-batch", description="Solve many Klotski configurations in parallel.")
+    parser.add_argument("input", help="configurations, .csv or JSON lines")
+    parser.add_argument("output", help="results, .csv or JSON lines, written as jobs finish")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="astar", help="solver for jobs that name none")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--symmetry", action="store_true", help="store one of a state and its mirror (bfs, dfs, astar)")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc, which slows the solvers down")
+    parser.add_argument("--cache", action="store_true", help="skip the search for positions in the solution cache")
+    args = parser.parse_args(argv)
+
+    jobs = list(read_jobs(args.input, args.algorithm))
+    failed = run_batch(jobs, args.output, args.workers, args.symmetry, not args.no_memory, args.cache)
+    print(f"{len(jobs) - failed} of {len(jobs)} configurations solved")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
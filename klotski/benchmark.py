@@ -0,0 +1,139 @@
+# klotski-benchmark: runs every solver on every layout a number of times and writes the results in the layout of
+# Data.csv. Each run is a fresh Python process, so caches, the heap and the interned ints of one run never help the
+# next. The tables a solver loads from disk are built before its first run, so no run times a one-off build.
+# Search Time is in seconds, timed without tracemalloc, and Peak Memory in MB, measured by tracemalloc in a run of its
+# own. Every block of runs ends with its Mean, Median, Stddev and Min rows.
+import argparse
+import csv
+import importlib.util
+import json
+import statistics
+import subprocess
+import sys
+
+from klotski.batch import prepare
+from klotski.layouts import LAYOUTS, make_board
+from klotski.metrics import Metrics
+from klotski.solvers import ALGORITHMS, measured_solve
+
+LABELS = {
+    "astar": "A*",
+    "bfs": "BFS",
+    "dfs": "DFS",
+    "bidirectional": "Bidirectional BFS",
+    "ida": "IDA*",
+    "table": "Distance table",
+    "parallel": "Parallel BFS",
+    "hda": "HDA*",
+    "external": "External BFS",
+    "numpy": "NumPy BFS"
+}
+HEADER = ["Algorithm", "Search Time", "Peak Memory", "Moves", "Expanded"]
+SUMMARIES = [
+    ("Mean", statistics.mean),
+    ("Median", statistics.median),
+    ("Stddev", lambda values: statistics.stdev(values) if len(values) > 1 else 0.0),
+    ("Min", min)
+]
+
+
+def single_run(variant, algorithm, trace_memory=True):
+    #one measured solve in this process
+    board, initial_state = make_board(LAYOUTS[variant])
+    metrics = Metrics()
+    solution, seconds, peak = measured_solve(board, initial_state, algorithm, trace_memory=trace_memory, metrics=metrics)
+    return {
+        "seconds": seconds,
+        "peak_mb": peak / 1024 / 1024,
+        "moves": len(solution) if solution is not None else None,
+        "expanded": metrics.expanded
+    }
+
+
+def run_in_subprocess(variant, algorithm, trace_memory=True, timeout=None):
+    command = [sys.executable, "-m", "klotski.benchmark", "--single", variant, algorithm]
+    if not trace_memory:
+        command.append("--no-memory")
+    completed = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                               timeout=timeout, check=True)
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def default_algorithms():
+    #every solver whose dependencies are installed, numpy is an optional extra
+    return [algorithm for algorithm in ALGORITHMS if algorithm != "numpy" or importlib.util.find_spec("numpy")]
+
+
+def summary_row(name, function, runs):
+    row = [name]
+    for field in ("seconds", "peak_mb", "moves", "expanded"):
+        values = [run[field] for run in runs if run[field] is not None]
+        row.append(round(function(values), 4) if values else "")
+    return row
+
+
+def measured_run(variant, algorithm, trace_memory=True, timeout=None):
+    #the time of an untraced run, and with trace_memory the peak of a second, traced run (tracemalloc slows the
+    #solvers down several times, so the traced run is never the one timed)
+    run = run_in_subprocess(variant, algorithm, False, timeout)
+    run["peak_mb"] = run_in_subprocess(variant, algorithm, True, timeout)["peak_mb"] if trace_memory else None
+    return run
+
+
+def benchmark(variants, algorithms, repetitions, output, trace_memory=True, timeout=None):
+    #writes one block of runs plus summary rows per (algorithm, variant) and flushes it, so a long run can be watched
+    with open(output, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADER)
+        for algorithm in algorithms:
+            for variant in variants:
+                label = f"{LABELS.get(algorithm, algorithm)} ({variant.capitalize()})"
+                prepare(make_board(LAYOUTS[variant])[0], algorithm)
+                runs = []
+                for repetition in range(repetitions):
+                    try:
+                        run = measured_run(variant, algorithm, trace_memory, timeout)
+                    except subprocess.TimeoutExpired:
+                        writer.writerow([label, "timeout", "", "", ""]) #left out of the summary rows
+                        continue
+                    except subprocess.CalledProcessError as error:
+                        writer.writerow([label, "error", "", "", ""]) #left out of the summary rows as well
+                        lines = error.stderr.strip().splitlines()
+                        print(f"{label} run {repetition + 1}/{repetitions} failed: {lines[-1] if lines else error}",
+                              file=sys.stderr)
+                        continue
+                    runs.append(run)
+                    peak = round(run["peak_mb"], 4) if run["peak_mb"] is not None else ""
+                    writer.writerow([label, round(run["seconds"], 4), peak, run["moves"],
+                                     run["expanded"] if run["expanded"] is not None else ""])
+                    print(f"{label} run {repetition + 1}/{repetitions}: {run['seconds']:.4f} seconds", file=sys.stderr)
+                for name, function in SUMMARIES:
+                    if runs:
+                        writer.writerow(summary_row(name, function, runs))
+                writer.writerow([""] * len(HEADER))
+                writer.writerow([""] * len(HEADER))
+                file.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="klotski-benchmark", description="Benchmark the Klotski solvers.")
+    parser.add_argument("--variants", nargs="+", choices=sorted(LAYOUTS), default=list(LAYOUTS),
+                        help="layouts to run (default: all)")
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=default_algorithms(),
+                        help="solvers to run (default: all whose dependencies are installed)")
+    parser.add_argument("--repetitions", type=int, default=10, help="runs per solver and layout (default: 10)")
+    parser.add_argument("--output", default="Data.csv", help="CSV file to write (default: Data.csv)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds before a run is killed")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced runs that measure Peak Memory")
+    parser.add_argument("--single", nargs=2, metavar=("VARIANT", "ALGORITHM"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single:
+        print(json.dumps(single_run(*args.single, trace_memory=not args.no_memory)))
+        return 0
+    benchmark(args.variants, args.algorithms, args.repetitions, args.output, not args.no_memory, args.timeout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# Bidirectional BFS: one search grows forward from the start, the other backward from every goal state at once.
+# Slides are reversible, so the backward search uses the same board.moves as the forward one.
+
+def expand_level(board, frontier, this_side, other_side, metrics=None, depth=0):
+    # expands one whole level of one side, returns the next level and the first state found by the other side.
+    # this_side maps a canonical key to the state it was reached from (None for the roots).
+    # depth is the number of levels both sides have grown so far, only used for metrics
+    next_frontier = []
+    for state in frontier:
+        kept = len(next_frontier)
+        moves = board.moves(state)
+        for _, _, neighbor in moves:
+            neighbor_key = board.key(neighbor)
+            if neighbor_key in this_side:
+                continue
+            this_side[neighbor_key] = state
+            if neighbor_key in other_side:
+                return next_frontier, neighbor
+            next_frontier.append(neighbor)
+        if metrics is not None:
+            metrics.update(len(moves), len(next_frontier) - kept, len(next_frontier), depth + 1)
+    return next_frontier, None
+
+
+def bidirectional_bfs(board, initial_state, metrics=None):
+    # metrics, when given, counts the states expanded by both sides, see klotski/metrics.py
+    if board.is_goal(initial_state):
+        return []
+
+    forward = {board.key(initial_state): None} #key -> previous state on the way from the start
+    backward = {} #key -> next state on the way to the goal
+    forward_frontier = [initial_state]
+    backward_frontier = board.goal_states()
+    for goal in backward_frontier:
+        backward[board.key(goal)] = None
+
+    meeting = None
+    depth = 0
+    while meeting is None and forward_frontier and backward_frontier:
+        # always grow the smaller frontier by one full level. Before the level no state was on both sides,
+        # so the first state that meets is at the deepest backward (or forward) level and the path is optimal
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting = expand_level(board, forward_frontier, forward, backward, metrics, depth)
+        else:
+            backward_frontier, meeting = expand_level(board, backward_frontier, backward, forward, metrics, depth)
+        depth += 1
+
+    if meeting is None:
+        return None
+
+    path = []
+    state = forward[board.key(meeting)]
+    while state is not None:
+        path.append(state)
+        state = forward[board.key(state)]
+    path.reverse()
+    path = path[1:]
+
+    state = meeting
+    while state is not None:
+        path.append(state)
+        state = backward[board.key(state)]
+    # the backward half was labelled from some goal state
+    return board.relabel_path(path, initial_state)
@@ -0,0 +1,376 @@
+# Bitboard model of a sliding block board.
+#
+# Cells are numbered row by row (cell = row * cols + col) and bit `cell` of an int is set
+# when that cell is covered, so a whole board occupancy is a single int.
+# A state is also a single int: the top-left cell of piece i lives in the i-th fixed-width field,
+# which makes states cheap to hash and a one cell move a single add or subtract on the state.
+# Above the piece fields the state carries the blank cells as an occupancy-style mask and, per cell, the index + 1
+# of the piece covering it (0 when blank). A move adds one precomputed delta that updates all three parts, and
+# move generation only looks at the pieces next to the blank cells.
+
+from functools import lru_cache
+
+LEFT, RIGHT, UP, DOWN = 0, 1, 2, 3
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+DIRECTION_NAMES = ["left", "right", "up", "down"]
+WORD_MASK = (1 << 64) - 1
+
+
+def key_hash(key):
+    # hash(int) is the int itself below 2**61, so slots taken from it (key % size) only see the target block's
+    # bit plane. Fold the key's 64-bit words through the splitmix64 finaliser so every bit reaches the slot
+    mixed = 0
+    while True:
+        mixed ^= key & WORD_MASK
+        mixed = ((mixed ^ (mixed >> 30)) * 0xBF58476D1CE4E5B9) & WORD_MASK
+        mixed = ((mixed ^ (mixed >> 27)) * 0x94D049BB133111EB) & WORD_MASK
+        mixed ^= mixed >> 31
+        key >>= 64
+        if not key:
+            return mixed
+
+
+@lru_cache(maxsize=None)
+def shape_moves(cols, rows, width, height):
+    # move table of one piece shape, built once per board size: for every top-left cell the shape fits on,
+    # the legal one cell slides as (direction, cell delta, cells that must be empty). Those are the cells the piece
+    # enters, so a slide is legal when they are free in the occupancy of the whole board. Cells the shape does not
+    # fit on map to None
+    table = [None] * (cols * rows)
+    for row in range(rows - height + 1):
+        for col in range(cols - width + 1):
+            slides = []
+            for direction, (dx, dy) in enumerate(DIRECTIONS):
+                if not (0 <= col + dx <= cols - width and 0 <= row + dy <= rows - height):
+                    continue
+                entered = 0
+                for r in range(row + dy, row + dy + height):
+                    for c in range(col + dx, col + dx + width):
+                        if not (row <= r < row + height and col <= c < col + width):
+                            entered |= 1 << (r * cols + c)
+                slides.append((direction, dy * cols + dx, entered))
+            table[row * cols + col] = tuple(slides)
+    return tuple(table)
+
+
+class Board:
+    def __init__(self, shapes, cols=4, rows=5, target=(1, 3)):
+        # shapes: (width, height) in cells for every piece, piece 0 is the block that has to reach target
+        self.shapes = [tuple(shape) for shape in shapes]
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        self.target = tuple(target)
+        self.target_cell = target[1] * cols + target[0]
+
+        self.bits = max(1, (self.cells - 1).bit_length())
+        self.field = (1 << self.bits) - 1
+
+        # mask of every shape with its top-left corner on cell 0
+        self.shape_masks = []
+        for width, height in self.shapes:
+            mask = 0
+            for row in range(height):
+                for col in range(width):
+                    mask |= 1 << (row * cols + col)
+            self.shape_masks.append(mask)
+
+        # cells the target block covers once solved
+        self.goal_mask = self.shape_masks[0] << self.target_cell
+
+        # pieces of the same shape are interchangeable, so they share one plane of the canonical key.
+        # The target block always gets a plane of its own even if another piece has its shape
+        self.groups = []
+        group_of = {}
+        for i, shape in enumerate(self.shapes):
+            label = (shape, i == 0)
+            if label not in group_of:
+                group_of[label] = len(self.groups)
+                self.groups.append([])
+            self.groups[group_of[label]].append(i)
+        self.group_shifts = [0] * len(self.shapes)
+        for g, group in enumerate(self.groups):
+            for i in group:
+                self.group_shifts[i] = g * self.cells
+
+        # cell each piece's top-left corner lands on when the board is flipped left to right
+        self.mirror_cells = []
+        for width, height in self.shapes:
+            self.mirror_cells.append([cell - cell % cols + max(cols - cell % cols - width, 0) for cell in range(self.cells)])
+        # the mirror trick only holds when the goal is its own mirror image
+        self.symmetric = cols - self.target[0] - self.shapes[0][0] == self.target[0]
+
+        # perfect rank of a state: shape groups are placed biggest first (target first), and the top-left cells of a
+        # group are ranked as a combination of the cells still free after the groups before it. The mixed radix of
+        # those combination ranks is unique per canonical key and far smaller than ranking every group over all cells
+        self.choose = [[0] * (self.cells + 1) for _ in range(self.cells + 1)]
+        for a in range(self.cells + 1):
+            self.choose[a][0] = 1
+            for b in range(1, a + 1):
+                self.choose[a][b] = self.choose[a - 1][b - 1] + self.choose[a - 1][b]
+        self.rank_groups = [self.groups[0]] + sorted(self.groups[1:], key=lambda group: -self.shape_area(group[0]))
+        self.rank_radix = []
+        self.rank_size = 1
+        free = self.cells
+        for group in self.rank_groups:
+            self.rank_radix.append(self.choose[free][len(group)])
+            self.rank_size *= self.rank_radix[-1]
+            free -= self.shape_area(group[0]) * len(group)
+
+        # cells where the top-left corner of each piece keeps the whole piece on the board
+        self.fits = []
+        for width, height in self.shapes:
+            self.fits.append([row * cols + col for row in range(rows - height + 1) for col in range(cols - width + 1)])
+
+        # layout of the parts above the piece fields: the blank mask, then owner_bits per cell for the owner grid
+        self.cells_mask = (1 << self.cells) - 1
+        self.blank_shift = self.bits * len(self.shapes)
+        self.owner_bits = len(self.shapes).bit_length()
+        self.owner_mask = (1 << self.owner_bits) - 1
+        self.grid_shift = self.blank_shift + self.cells
+
+        # per piece and top-left cell: the cells the piece covers and its owner grid entries
+        self.covers = [[mask << cell for cell in range(self.cells)] for mask in self.shape_masks]
+        self.owner_grids = []
+        for i, cover in enumerate(self.covers):
+            self.owner_grids.append([sum((i + 1) << (self.owner_bits * c) for c in range(self.cells) if mask >> c & 1)
+                                     for mask in cover])
+
+        # slide_tables[i][cell][direction]: None when piece i on cell cannot slide that way on an empty board, else
+        # (cells it enters, lowest of them, delta). The delta moves the piece field, clears the entered cells from the
+        # blank mask and sets the ones left behind, and rewrites the owner grid, all as one signed add to the state
+        self.slide_tables = []
+        for i, (width, height) in enumerate(self.shapes):
+            step = 1 << (self.bits * i)
+            table = []
+            for cell, slides in enumerate(shape_moves(cols, rows, width, height)):
+                by_direction = [None] * len(DIRECTIONS)
+                for direction, delta, entered in slides or ():
+                    left = self.covers[i][cell] & ~self.covers[i][cell + delta]
+                    by_direction[direction] = (entered, entered & -entered, delta * step
+                                               + ((left - entered) << self.blank_shift)
+                                               + ((self.owner_grids[i][cell + delta] - self.owner_grids[i][cell])
+                                                  << self.grid_shift))
+                table.append(by_direction)
+            self.slide_tables.append(table)
+
+        # blank_sources[cell]: (direction, owner grid shift of the neighbouring cell) for every side of cell,
+        # the piece on that neighbour is the only one that can slide into cell in that direction
+        self.blank_sources = []
+        for cell in range(self.cells):
+            col, row = cell % cols, cell // cols
+            sources = []
+            for direction, (dx, dy) in enumerate(DIRECTIONS):
+                if 0 <= col - dx < cols and 0 <= row - dy < rows:
+                    sources.append((direction, self.owner_bits * (cell - dx - dy * cols)))
+            self.blank_sources.append(sources)
+
+    def shape_area(self, index):
+        width, height = self.shapes[index]
+        return width * height
+
+    def encode(self, positions):
+        # positions: (col, row) of the top-left corner of every piece
+        return self.pack([row * self.cols + col for col, row in positions])
+
+    def pack(self, cells):
+        # the state of the pieces on the given top-left cells, with its blank mask and owner grid.
+        # Overlapping pieces give a garbage grid, only collides may be asked about such a state
+        state = 0
+        covered = 0
+        grid = 0
+        for i, cell in enumerate(cells):
+            state |= cell << (self.bits * i)
+            covered |= self.covers[i][cell]
+            grid |= self.owner_grids[i][cell]
+        return state | ((self.cells_mask ^ covered) << self.blank_shift) | (grid << self.grid_shift)
+
+    def cells_of(self, state):
+        field, bits = self.field, self.bits
+        return [(state >> (bits * i)) & field for i in range(len(self.shapes))]
+
+    def positions(self, state):
+        return [divmod(cell, self.cols)[::-1] for cell in self.cells_of(state)]
+
+    def position(self, state, index):
+        cell = (state >> (self.bits * index)) & self.field
+        return cell % self.cols, cell // self.cols
+
+    def masks(self, state):
+        return [cover[cell] for cover, cell in zip(self.covers, self.cells_of(state))]
+
+    def occupancy(self, state):
+        return self.cells_mask ^ ((state >> self.blank_shift) & self.cells_mask)
+
+    def blanks(self, state):
+        return (state >> self.blank_shift) & self.cells_mask
+
+    def key(self, state):
+        # canonical key: one bit per occupied top-left cell in the plane of the piece's shape group,
+        # so states that only differ by swapping identical pieces get the same key
+        key = 0
+        for cell, shift in zip(self.cells_of(state), self.group_shifts):
+            key |= 1 << (cell + shift)
+        return key
+
+    def mirror(self, state):
+        return self.pack([self.mirror_cells[i][cell] for i, cell in enumerate(self.cells_of(state))])
+
+    def symmetric_key(self, state):
+        # with a symmetric goal a state and its mirror are equally far from solved,
+        # so both share the smaller of their two canonical keys
+        key = mirrored = 0
+        mirror_cells, shifts = self.mirror_cells, self.group_shifts
+        for i, cell in enumerate(self.cells_of(state)):
+            key |= 1 << (cell + shifts[i])
+            mirrored |= 1 << (mirror_cells[i][cell] + shifts[i])
+        return min(key, mirrored)
+
+    def rank(self, state):
+        return self.rank_cells(self.cells_of(state))
+
+    def symmetric_rank(self, state):
+        # symmetric_key as a rank: the smaller rank of a state and its mirror
+        return min(self.rank(state), self.rank(self.mirror(state)))
+
+    def rank_cells(self, cells):
+        choose, shape_masks = self.choose, self.shape_masks
+        rank = 0
+        covered = 0
+        for group, radix in zip(self.rank_groups, self.rank_radix):
+            group_rank = 0
+            for j, cell in enumerate(sorted(cells[i] for i in group)):
+                # index of the cell among the cells the earlier groups left free
+                group_rank += choose[cell - (covered & ((1 << cell) - 1)).bit_count()][j + 1]
+            for i in group:
+                covered |= shape_masks[i] << cells[i]
+            rank = rank * radix + group_rank
+        return rank
+
+    def unrank(self, rank):
+        # the state of a rank under one labelling of identical pieces, the inverse of rank_cells up to that labelling
+        choose = self.choose
+        group_ranks = []
+        for radix in reversed(self.rank_radix):
+            rank, group_rank = divmod(rank, radix)
+            group_ranks.append(group_rank)
+        cells = [0] * len(self.shapes)
+        covered = 0
+        for group, group_rank in zip(self.rank_groups, reversed(group_ranks)):
+            free = [cell for cell in range(self.cells) if not covered >> cell & 1]
+            chosen = []
+            # combinatorial number system, largest index first
+            index = len(free)
+            for j in range(len(group), 0, -1):
+                index -= 1
+                while choose[index][j] > group_rank:
+                    index -= 1
+                group_rank -= choose[index][j]
+                chosen.append(free[index])
+            for i, cell in zip(group, reversed(chosen)):
+                cells[i] = cell
+                covered |= self.shape_masks[i] << cell
+        return self.pack(cells)
+
+    def align(self, state, reference):
+        # relabel identical pieces of state so every piece that sits on the same cell in reference keeps its index.
+        # For two states one move apart this turns a path found under any labelling back into reference's labelling
+        cells = self.cells_of(state)
+        reference_cells = self.cells_of(reference)
+        aligned = list(cells)
+        for group in self.groups:
+            free = {cells[i] for i in group}
+            unmatched = []
+            for i in group:
+                if reference_cells[i] in free:
+                    aligned[i] = reference_cells[i]
+                    free.discard(reference_cells[i])
+                else:
+                    unmatched.append(i)
+            for i, cell in zip(unmatched, sorted(free)):
+                aligned[i] = cell
+        return self.pack(aligned)
+
+    def relabel_path(self, path, start):
+        # the states of a path can come out under any labelling of identical pieces (keys ignore it),
+        # align each one to the state before it so the whole path uses start's piece indices
+        relabelled = []
+        previous = start
+        for state in path:
+            previous = self.align(state, previous)
+            relabelled.append(previous)
+        return relabelled
+
+    def goal_states(self):
+        # every arrangement with the target block on its goal cell, one state per canonical key
+        order = [i for group in self.groups for i in group]
+        first_of_group = {group[0] for group in self.groups}
+        cells = [0] * len(self.shapes)
+        goals = []
+
+        def place(k, occupied):
+            if k == len(order):
+                goals.append(self.pack(cells))
+                return
+            i = order[k]
+            # identical pieces are placed in increasing cell order so each arrangement appears once
+            start = 0 if i in first_of_group else cells[order[k - 1]] + 1
+            candidates = [self.target_cell] if i == 0 else self.fits[i]
+            for cell in candidates:
+                if cell < start:
+                    continue
+                mask = self.shape_masks[i] << cell
+                if not mask & occupied:
+                    cells[i] = cell
+                    place(k + 1, occupied | mask)
+
+        place(0, 0)
+        return goals
+
+    def is_goal(self, state):
+        return (state & self.field) == self.target_cell
+
+    def collides(self, state, index):
+        masks = self.masks(state)
+        others = 0
+        for i, mask in enumerate(masks):
+            if i != index:
+                others |= mask
+        return (masks[index] & others) != 0
+
+    def moves(self, state):
+        # every legal one cell slide as (piece index, direction, new state). Only a piece next to a blank cell can
+        # slide, so for each blank and side the owner grid names the one candidate, and its slide table entry says
+        # whether all cells it enters are blank. A piece entering two blanks is reported from the lowest one only
+        blanks = (state >> self.blank_shift) & self.cells_mask
+        grid = state >> self.grid_shift
+        bits, field, owner_mask = self.bits, self.field, self.owner_mask
+        slide_tables, blank_sources = self.slide_tables, self.blank_sources
+        result = []
+        remaining = blanks
+        while remaining:
+            blank = remaining & -remaining
+            remaining ^= blank
+            for direction, owner_shift in blank_sources[blank.bit_length() - 1]:
+                owner = (grid >> owner_shift) & owner_mask
+                if owner:
+                    i = owner - 1
+                    slide = slide_tables[i][(state >> (bits * i)) & field][direction]
+                    if slide is not None and slide[1] == blank and slide[0] & blanks == slide[0]:
+                        result.append((i, direction, state + slide[2]))
+        return result
+
+    def neighbors(self, state):
+        return [new_state for _, _, new_state in self.moves(state)]
+
+    def move_code(self, state, index, direction):
+        # the slide of piece index that led to state as one small int, the cell its top-left corner moved to and the
+        # direction. It names no piece index, so it stays valid under any labelling of identical pieces
+        return ((state >> (self.bits * index)) & self.field) * len(DIRECTIONS) + direction
+
+    def unmove(self, state, code):
+        # the state before the slide move_code recorded, the piece is found through the owner grid
+        cell, direction = divmod(code, len(DIRECTIONS))
+        i = ((state >> (self.grid_shift + self.owner_bits * cell)) & self.owner_mask) - 1
+        dx, dy = DIRECTIONS[direction]
+        return state - self.slide_tables[i][cell - dx - dy * self.cols][direction][2]
@@ -0,0 +1,73 @@
+# klotski-solve: solves a puzzle layout from the command line, pygame is only imported for --visualize
+import argparse
+import sys
+
+from klotski.bitboard import DIRECTION_NAMES
+from klotski.heuristics import HEURISTICS, load_heuristic
+from klotski.layouts import LAYOUTS, make_board
+from klotski.metrics import Metrics
+from klotski.solution_cache import SolutionCache
+from klotski.solvers import ALGORITHMS, hint, measured_solve, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="klotski-solve", description="Solve a Klotski puzzle without opening a window.")
+    parser.add_argument("--variant", choices=sorted(LAYOUTS), default="standard", help="starting layout (default: standard)")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="astar", help="solver to run (default: astar)")
+    parser.add_argument("--symmetry", action="store_true",
+                        help="store one of a state and its mirror (bfs, dfs, astar, parallel, hda, external, numpy)")
+    parser.add_argument("--compact", action="store_true",
+                        help="keep visited states in an array-backed hash table, a few bytes each (bfs, dfs, astar)")
+    parser.add_argument("--weight", type=float, default=1, help="heuristic weight of astar, 1 keeps it optimal")
+    parser.add_argument("--heuristic", choices=HEURISTICS, default="pdb",
+                        help="estimate of astar, ida and hda: the pattern database or the grid-unit bound (default: pdb)")
+    parser.add_argument("--table-size", type=int, default=1 << 16, help="transposition table slots of ida")
+    parser.add_argument("--workers", type=int, default=None, help="processes of parallel and hda (default: one per core)")
+    parser.add_argument("--memory-budget", type=float, default=64, metavar="MB",
+                        help="RAM for the successor buffer of external (default: 64)")
+    parser.add_argument("--temp-dir", default=None,
+                        help="directory for the level files of external (default: the system temporary directory)")
+    parser.add_argument("--cache", action="store_true",
+                        help="answer positions solved before from the solution cache, and store new solutions in it")
+    parser.add_argument("--progress", type=float, default=None, metavar="SECONDS",
+                        help="report search counters to stderr every SECONDS (default: off, no counting at all)")
+    parser.add_argument("--memory", action="store_true",
+                        help="report the peak memory, traced with tracemalloc, which slows the solver down several times")
+    parser.add_argument("--hint", action="store_true", help="only print the best first move, from the distance table")
+    parser.add_argument("--visualize", action="store_true", help="open the game window and play the solution")
+    args = parser.parse_args(argv)
+
+    board, initial_state = make_board(LAYOUTS[args.variant])
+    if args.hint:
+        move = hint(board, initial_state)
+        if move is None:
+            print("No move to suggest.")
+            return 1
+        tile, direction, _ = move
+        col, row = board.position(initial_state, tile)
+        print(f"Move the tile at column {col}, row {row} {DIRECTION_NAMES[direction]}")
+        return 0
+    metrics = None
+    if args.progress is not None:
+        metrics = Metrics(lambda metrics: print(metrics, file=sys.stderr), args.progress)
+    #None leaves the pattern database to the solvers, which load it only when they need it
+    heuristic = load_heuristic(board, args.heuristic) if args.heuristic != "pdb" else None
+    try:
+        solution, seconds, peak = measured_solve(board, initial_state, args.algorithm, trace_memory=args.memory,
+                                                 symmetry=args.symmetry, weight=args.weight, table_size=args.table_size,
+                                                 heuristic=heuristic, workers=args.workers, metrics=metrics,
+                                                 compact=args.compact,
+                                                 memory_budget=int(args.memory_budget * 1024 * 1024), temp_dir=args.temp_dir,
+                                                 cache=SolutionCache() if args.cache else None)
+    except ValueError as error:
+        parser.error(str(error))
+    report(solution, seconds, peak if args.memory else None)
+
+    if args.visualize:
+        from klotski import gui #imported here so a headless run never loads pygame
+        gui.main(args.variant, args.algorithm, solution=solution, symmetry=args.symmetry)
+    return 0 if solution is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# Compact visited sets for searches that do not fit in dicts of Python ints.
+#
+# Keys are non-negative ints below a known limit (a state's rank, see Board.rank), stored + 1 in an open addressing
+# table over array("I") or array("Q"), so 0 marks an empty slot. Slots come from Fibonacci hashing of the key and
+# collisions probe linearly. At most 3/4 of the slots are used before the table doubles, which puts a rank below
+# 2**32 at 5 to 11 bytes per state instead of the ~100 a dict entry and its int cost.
+from array import array
+
+FIBONACCI = 0x9E3779B97F4A7C15 #2**64 / golden ratio, spreads dense keys such as ranks over the table
+WORD_MASK = (1 << 64) - 1
+
+
+def key_typecode(limit):
+    # the narrowest array type that holds every key + 1 for keys below limit
+    if limit < (1 << 32) - 1:
+        return "I"
+    if limit < (1 << 64) - 1:
+        return "Q"
+    raise ValueError(f"keys up to {limit} do not fit in 64 bits, the board is too big for a compact set")
+
+
+class CompactSet:
+    def __init__(self, limit, capacity=1 << 10):
+        # limit: every key is below it, capacity: expected number of keys
+        self.limit = limit
+        self.typecode = key_typecode(limit)
+        self.used = 0
+        size = 8
+        while size * 3 < capacity * 4:
+            size *= 2
+        self.allocate(size)
+
+    def allocate(self, size):
+        self.size = size
+        self.mask = size - 1
+        self.shift = 64 - (size.bit_length() - 1)
+        self.keys = array(self.typecode, bytes(array(self.typecode).itemsize * size))
+
+    def slot(self, key):
+        # index of key in the table, or of the empty slot it would go to
+        stored = key + 1
+        keys, mask = self.keys, self.mask
+        index = ((stored * FIBONACCI) & WORD_MASK) >> self.shift
+        while True:
+            found = keys[index]
+            if found == stored or found == 0:
+                return index
+            index = (index + 1) & mask
+
+    def __contains__(self, key):
+        return self.keys[self.slot(key)] != 0
+
+    def __len__(self):
+        return self.used
+
+    def __iter__(self):
+        for stored in self.keys:
+            if stored:
+                yield stored - 1
+
+    def add(self, key):
+        index = self.slot(key)
+        if self.keys[index] == 0:
+            self.insert(index, key)
+        return index
+
+    def insert(self, index, key):
+        self.keys[index] = key + 1
+        self.used += 1
+        if self.used * 4 > self.size * 3:
+            self.grow()
+
+    def grow(self):
+        old_keys = self.keys
+        self.allocate(self.size * 2)
+        for stored in old_keys:
+            if stored:
+                self.keys[self.slot(stored - 1)] = stored
+
+    @property
+    def nbytes(self):
+        return self.keys.itemsize * self.size
+
+
+class CompactMap(CompactSet):
+    # a CompactSet with one small int per key in a parallel array, e.g. a move code or a g value
+    def __init__(self, limit, capacity=1 << 10, value_typecode="H"):
+        self.value_typecode = value_typecode
+        super().__init__(limit, capacity)
+
+    def allocate(self, size):
+        super().allocate(size)
+        self.values = array(self.value_typecode, bytes(array(self.value_typecode).itemsize * size))
+
+    def __getitem__(self, key):
+        index = self.slot(key)
+        if self.keys[index] == 0:
+            raise KeyError(key)
+        return self.values[index]
+
+    def get(self, key, default=None):
+        index = self.slot(key)
+        if self.keys[index] == 0:
+            return default
+        return self.values[index]
+
+    def __setitem__(self, key, value):
+        index = self.slot(key)
+        if self.keys[index] == 0:
+            self.values[index] = value
+            self.insert(index, key) #may grow, after the value is in place so it moves along
+        else:
+            self.values[index] = value
+
+    def grow(self):
+        old_keys, old_values = self.keys, self.values
+        self.allocate(self.size * 2)
+        for stored, value in zip(old_keys, old_values):
+            if stored:
+                index = self.slot(stored - 1)
+                self.keys[index] = stored
+                self.values[index] = value
+
+    @property
+    def nbytes(self):
+        return (self.keys.itemsize + self.values.itemsize) * self.size
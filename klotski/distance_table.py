@@ -0,0 +1,112 @@
+# Complete distance-to-goal table.
+#
+# A retrograde BFS from every goal state enumerates every position that can still be solved and stores its
+# exact distance in a file of uint16 indexed by Board.rank. The file is memory-mapped on load, so only the pages
+# that lookups touch are read, and solving is a walk downhill: O(solution length) lookups, no search.
+import mmap
+import os
+from array import array
+from collections import deque
+
+from klotski.storage import board_signature, cache_path
+
+UNREACHED = 0xFFFF
+
+
+class DistanceTable:
+    def __init__(self, board):
+        self.board = board
+        self.size = board.rank_size
+        self.table = None
+        self.mapping = None
+
+    def build(self):
+        board = self.board
+        table = array("H", [UNREACHED]) * self.size
+        queue = deque()
+        for goal in board.goal_states():
+            table[board.rank(goal)] = 0
+            queue.append(goal)
+        # slides are reversible, so a forward BFS from the goals finds every position's distance to its nearest goal
+        while queue:
+            state = queue.popleft()
+            distance = table[board.rank(state)] + 1
+            if distance >= UNREACHED:
+                raise ValueError("distance to goal does not fit the 16-bit table")
+            for neighbor in board.neighbors(state):
+                index = board.rank(neighbor)
+                if table[index] == UNREACHED:
+                    table[index] = distance
+                    queue.append(neighbor)
+        self.table = table
+        return self
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            self.table.tofile(file)
+
+    def open(self, path):
+        with open(path, "rb") as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.table = memoryview(self.mapping).cast("H")
+        return self
+
+    def close(self):
+        if self.mapping is not None:
+            self.table.release()
+            self.mapping.close()
+            self.mapping = None
+        self.table = None
+
+    def distance(self, state):
+        # exact number of moves to the goal, None when the position cannot be solved
+        distance = self.table[self.board.rank(state)]
+        return None if distance == UNREACHED else distance
+
+    def hint(self, state):
+        # the first move of an optimal solution as (piece index, direction, new state), None when the position is
+        # solved or cannot be solved. One lookup per legal move
+        distance = self.distance(state)
+        if not distance:
+            return None
+        for tile, direction, neighbor in self.board.moves(state):
+            if self.table[self.board.rank(neighbor)] == distance - 1:
+                return tile, direction, neighbor
+        return None
+
+    def solve(self, state):
+        distance = self.distance(state)
+        if distance is None:
+            return None
+        path = []
+        while distance > 0:
+            # some neighbour is always exactly one move closer
+            for neighbor in self.board.neighbors(state):
+                if self.table[self.board.rank(neighbor)] == distance - 1:
+                    state = neighbor
+                    break
+            path.append(state)
+            distance -= 1
+        return path
+
+
+def distance_table_path(board):
+    return cache_path("distance_table_%s.bin" % board_signature(board))
+
+
+def distance_table_saved(board):
+    # whether load_distance_table maps the table from disk instead of building it, which takes seconds
+    path = distance_table_path(board)
+    return os.path.exists(path) and os.path.getsize(path) == board.rank_size * array("H").itemsize
+
+
+def load_distance_table(board, path=None):
+    # memory-maps the table, building and saving it first if this board has never been enumerated
+    table = DistanceTable(board)
+    if path is None:
+        path = distance_table_path(board)
+    if not os.path.exists(path) or os.path.getsize(path) != table.size * array("H").itemsize:
+        table.build()
+        table.save(path)
+        table.table = None
+    return table.open(path)
@@ -0,0 +1,167 @@
+# BFS with the levels kept on disk instead of in a deque and a visited dict.
+#
+# Every level is a file of the sorted, unique ranks of its states (Board.rank, or Board.symmetric_rank with symmetry)
+# as fixed-width binary ints, and every state is rebuilt from its rank with Board.unrank when it is expanded.
+# Expanding a level fills a buffer of successor ranks, and each full buffer is sorted and written out as a run.
+# Then the runs are merged with the current and the previous level files, and every rank found in those two levels is
+# dropped (delayed duplicate detection). Slides are reversible, so a successor of level d can only sit on level d - 1,
+# d or d + 1, and those two files are all the history a level needs. Files are only ever read and written front to
+# back, and memory holds one buffer plus a read-ahead chunk per merged file, whatever the size of the search.
+# The path is found backwards from the goal: one scan of each earlier level finds a predecessor of the state after it.
+import heapq
+import os
+import tempfile
+from array import array
+from itertools import repeat
+
+from klotski.compact import key_typecode
+from klotski.solvers import state_key_function
+
+BYTES_PER_KEY = 48 #a buffered rank while sorted: the int object plus its pointer in the list sorted() builds
+MIN_CHUNK = 1024 #ranks read at a time from every merged file
+
+
+def read_keys(path, typecode, chunk):
+    # the ranks of a level or run file in order, chunk of them in memory at a time
+    with open(path, "rb") as file:
+        while True:
+            keys = array(typecode)
+            keys.frombytes(file.read(chunk * keys.itemsize))
+            if not keys:
+                return
+            yield from keys
+
+
+class KeyWriter:
+    # appends ranks to a file through a buffer of chunk ranks
+    def __init__(self, path, typecode, chunk):
+        self.file = open(path, "wb")
+        self.typecode = typecode
+        self.chunk = chunk
+        self.buffer = array(typecode)
+        self.count = 0
+
+    def write(self, key):
+        self.buffer.append(key)
+        if len(self.buffer) >= self.chunk:
+            self.flush()
+
+    def flush(self):
+        self.buffer.tofile(self.file)
+        self.count += len(self.buffer)
+        self.buffer = array(self.typecode)
+
+    def close(self):
+        self.flush()
+        self.file.close()
+        return self.count
+
+
+class LevelFiles:
+    # the files of one search in directory, level d is level_d.bin and the runs of the level being built run_n.bin
+    def __init__(self, directory, typecode, memory):
+        self.directory = directory
+        self.typecode = typecode
+        self.buffer_size = max(MIN_CHUNK, memory // BYTES_PER_KEY)
+
+    def level(self, depth):
+        return os.path.join(self.directory, f"level_{depth}.bin")
+
+    def run(self, index):
+        return os.path.join(self.directory, f"run_{index}.bin")
+
+    def write_run(self, index, keys):
+        with open(self.run(index), "wb") as file:
+            array(self.typecode, sorted(set(keys))).tofile(file)
+
+    def merge(self, runs, depth):
+        # writes level depth + 1: the ranks of the runs that are neither on level depth nor on level depth - 1.
+        # Old ranks are tagged 0 and new ones 1, so the merge sees an old copy of a rank before any new one
+        chunk = max(MIN_CHUNK, self.buffer_size // (runs + 3))
+        streams = [zip(read_keys(self.run(index), self.typecode, chunk), repeat(1)) for index in range(runs)]
+        for old in (depth, depth - 1):
+            if old >= 0:
+                streams.append(zip(read_keys(self.level(old), self.typecode, chunk), repeat(0)))
+        writer = KeyWriter(self.level(depth + 1), self.typecode, chunk)
+        previous = None
+        for key, new in heapq.merge(*streams):
+            if key != previous:
+                previous = key
+                if new:
+                    writer.write(key)
+        for index in range(runs):
+            os.remove(self.run(index))
+        return writer.close()
+
+    def find(self, depth, wanted):
+        # the first rank of level depth that is a key of wanted, by one scan of the file
+        chunk = max(MIN_CHUNK, self.buffer_size)
+        for key in read_keys(self.level(depth), self.typecode, chunk):
+            if key in wanted:
+                return key
+        return None
+
+
+def trace_back(board, files, goal, depth, key, initial_state):
+    # the states after every move from initial_state to goal, which lies on level depth. Each step takes the
+    # successor of the current state found on the level before, so the path is made of concrete neighbours
+    path = [goal]
+    state = goal
+    for level in range(depth - 1, -1, -1):
+        predecessors = {key(neighbor): neighbor for neighbor in board.neighbors(state)}
+        state = predecessors[files.find(level, predecessors)]
+        path.append(state)
+    path.reverse()
+    # with symmetry the walk can end on the mirror of the initial state, then the whole path is its mirror image
+    if board.key(path[0]) != board.key(initial_state):
+        path = [board.mirror(state) for state in path]
+    return board.relabel_path(path[1:], initial_state)
+
+
+def external_bfs(board, initial_state, symmetry=False, metrics=None, memory=64 << 20, directory=None):
+    # optimal like bfs_solver, with every level on disk in directory (default: a temporary directory, removed at the
+    # end). memory is the budget in bytes for the successor buffer, the rest of the search lives in the files.
+    # metrics, when given, is updated once per level, see klotski/metrics.py
+    if board.is_goal(initial_state):
+        return []
+    key = state_key_function(board, symmetry, compact=True)
+    with tempfile.TemporaryDirectory(dir=directory, prefix="klotski-bfs-") as workspace:
+        files = LevelFiles(workspace, key_typecode(board.rank_size), memory)
+        with open(files.level(0), "wb") as file:
+            array(files.typecode, [key(initial_state)]).tofile(file)
+
+        depth = 0
+        level = 1
+        while level:
+            buffer = []
+            runs = 0
+            generated = 0
+            goal = None
+            chunk = max(MIN_CHUNK, files.buffer_size // 4)
+            for state_key in read_keys(files.level(depth), files.typecode, chunk):
+                moves = board.moves(board.unrank(state_key))
+                generated += len(moves)
+                for _, _, neighbor in moves:
+                    if goal is None and board.is_goal(neighbor):
+                        goal = neighbor
+                    buffer.append(key(neighbor))
+                if len(buffer) >= files.buffer_size:
+                    files.write_run(runs, buffer)
+                    runs += 1
+                    buffer = []
+            if buffer:
+                files.write_run(runs, buffer)
+                runs += 1
+
+            # no goal was generated before this level, so a goal among the successors is one move further
+            if goal is not None:
+                if metrics is not None:
+                    metrics.update(generated, 0, 0, depth + 1, level)
+                return trace_back(board, files, goal, depth + 1, key, initial_state)
+
+            expanded = level
+            level = files.merge(runs, depth)
+            depth += 1
+            if metrics is not None:
+                metrics.update(generated, level, level, depth, expanded)
+        return None
@@ -0,0 +1,446 @@
+# Pygame window of the Klotski puzzles. Only the scripts and `klotski-solve --visualize` import this module,
+# the solvers and the command line run without pygame or a display.
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import time
+from functools import lru_cache
+
+import pygame
+
+from klotski.bitboard import DIRECTION_NAMES
+from klotski.distance_table import distance_table_saved, load_distance_table
+from klotski.incremental import IncrementalSolver
+from klotski.layouts import LAYOUTS, make_board
+from klotski.metrics import Metrics
+from klotski.solution_cache import MISS, SolutionCache
+from klotski.solvers import measured_solve, report
+
+BLOCK_SIZE = 100
+FPS = 60
+BACKGROUND_COLOR = (240, 240, 240)
+TARGET_COLOR = (220, 70, 70)
+FRAME_COLOR = (0, 0, 0)
+FRAME_THICKNESS = 5
+STATUS_COLOR = (40, 40, 40)
+PROGRESS_INTERVAL = 0.2 #seconds between two progress messages of the solver process
+LOCAL_EXPANSIONS = 1000 #A* expansions tried in the window process before a solver process is started, once the
+#pattern database is on disk (building it is left to the solver process)
+BLOCK_COLORS = [
+    (70, 70, 220),  # Blue
+    (220, 220, 70),  # Yellow
+    (70, 220, 70),  # Green
+    (220, 70, 220),  # Magenta
+    (70, 220, 220),  # Cyan
+    (220, 140, 70),  # Orange
+    (140, 70, 220),  # Purple
+    (220, 70, 140),  # Pink
+    (70, 140, 220),  # Sky Blue
+    (140, 220, 70),  # Lime
+    (70, 70, 70),  # Dark Gray
+    (255, 165, 0),  # Bright Orange
+]
+
+
+# Block class
+class Block:
+    def __init__(self, x, y, width, height, color):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.color = color
+        self.dragging = False
+
+    def draw(self, surface):
+        pygame.draw.rect(surface, self.color, self.rect)
+
+    def move(self, x, y):
+        self.rect.x = x
+        self.rect.y = y
+
+
+def make_blocks(layout):
+    #pixel blocks of a layout, the target block in red and the others in BLOCK_COLORS order
+    return [
+        Block(col * BLOCK_SIZE, row * BLOCK_SIZE, width * BLOCK_SIZE, height * BLOCK_SIZE,
+              TARGET_COLOR if i == 0 else BLOCK_COLORS[i - 1])
+        for i, (col, row, width, height) in enumerate(layout)
+    ]
+
+
+def encode_blocks(board, blocks):
+    #pixel positions of every tile -> bitboard state
+    return board.encode([(block.rect.x // BLOCK_SIZE, block.rect.y // BLOCK_SIZE) for block in blocks])
+
+
+def place_blocks(board, blocks, state):
+    #bitboard state -> pixel positions of every tile
+    for block, (col, row) in zip(blocks, board.positions(state)):
+        block.move(col * BLOCK_SIZE, row * BLOCK_SIZE)
+
+
+def draw_grid(surface):
+    width, height = surface.get_size()
+    for x in range(0, width, BLOCK_SIZE):
+        pygame.draw.line(surface, (200, 200, 200), (x, 0), (x, height))
+    for y in range(0, height, BLOCK_SIZE):
+        pygame.draw.line(surface, (200, 200, 200), (0, y), (width, y))
+
+
+def draw_target_frame(surface, target_rect):
+    pygame.draw.rect(surface, FRAME_COLOR, target_rect, FRAME_THICKNESS)
+
+
+@lru_cache(maxsize=None)
+def button_font():
+    #loaded once, after pygame.init
+    return pygame.font.Font(None, 36)
+
+
+def draw_button(surface, button_rect, label):
+    pygame.draw.rect(surface, (200, 200, 200), button_rect)
+    surface.blit(button_font().render(label, True, (0, 0, 0)), (button_rect.x + 10, button_rect.y + 5))
+    return button_rect
+
+
+# Solve button
+def solve_button_rect(surface):
+    return pygame.Rect(surface.get_width() // 2 - 50, surface.get_height() - 50, 100, 40)
+
+
+def draw_solve_button(surface, label="Solve"):
+    return draw_button(surface, solve_button_rect(surface), label)
+
+
+# Hint button, right of the solve button
+def hint_button_rect(surface):
+    return pygame.Rect(surface.get_width() - 110, surface.get_height() - 50, 100, 40)
+
+
+def draw_hint_button(surface):
+    return draw_button(surface, hint_button_rect(surface), "Hint")
+
+
+def draw_board(surface, blocks, target_rect):
+    surface.fill(BACKGROUND_COLOR)
+    draw_grid(surface)
+
+    for block in blocks:
+        block.draw(surface)
+
+    draw_target_frame(surface, target_rect)
+
+
+def draw_status(surface, font, text):
+    #one line of text over the top of the board, used for the solver progress
+    status = font.render(text, True, STATUS_COLOR, BACKGROUND_COLOR)
+    return surface.blit(status, (5, 5))
+
+
+class Renderer:
+    #draws the window by dirty rectangles. The background and grid are drawn once into a surface of their own, and a
+    #frame only repaints the rectangles whose content changed: blocks that moved, a new button label, the status line.
+    #Everything on top of the background (blocks, target frame, buttons, status) is redrawn clipped to each rectangle
+    def __init__(self, screen, blocks, target_rect, status_font):
+        self.screen = screen
+        self.blocks = blocks
+        self.target_rect = target_rect
+        self.status_font = status_font
+        self.background = pygame.Surface(screen.get_size())
+        self.background.fill(BACKGROUND_COLOR)
+        draw_grid(self.background)
+        self.drawn = [] #block rects as last painted
+        self.solve_label = "Solve"
+        self.status = None #status text as last painted
+        self.status_rect = None
+        self.dirty = [screen.get_rect()]
+
+    def set_solve_label(self, label):
+        if label != self.solve_label:
+            self.solve_label = label
+            self.dirty.append(solve_button_rect(self.screen))
+
+    def set_status(self, text):
+        #text of the status line, None hides it
+        if text == self.status:
+            return
+        if self.status_rect is not None:
+            self.dirty.append(self.status_rect)
+        self.status = text
+        self.status_rect = None
+        if text is not None:
+            self.status_rect = pygame.Rect((5, 5), self.status_font.size(text))
+            self.dirty.append(self.status_rect)
+
+    def paint(self):
+        #repaints and pushes to the display only what changed since the last call, returns whether anything did
+        rects = [block.rect.copy() for block in self.blocks]
+        for old, new in zip(self.drawn, rects):
+            if old != new:
+                self.dirty += [old, new]
+        self.drawn = rects
+        if not self.dirty:
+            return False
+        screen = self.screen
+        for rect in self.dirty:
+            screen.set_clip(rect)
+            screen.blit(self.background, rect, rect)
+            for block in self.blocks:
+                if block.rect.colliderect(rect):
+                    block.draw(screen)
+            draw_target_frame(screen, self.target_rect)
+            draw_solve_button(screen, self.solve_label)
+            draw_hint_button(screen)
+            if self.status is not None:
+                draw_status(screen, self.status_font, self.status)
+        screen.set_clip(None)
+        pygame.display.update(self.dirty)
+        self.dirty = []
+        return True
+
+
+def stop_solver(signum, frame):
+    #SIGTERM handler of the solver process: the parallel solvers' workers go down with it
+    for child in multiprocessing.active_children():
+        child.terminate()
+    os._exit(1)
+
+
+def solve_in_background(board, state, algorithm, symmetry, results, incremental=None):
+    #runs in the solver process, the window process only ever reads results. The solution goes into the cache too,
+    #so pressing Solve on this position again is answered by the window process without starting a solver.
+    #Where there is no SIGTERM to catch (Windows), the workers notice the solver process is gone and exit by themselves.
+    #No tracemalloc, it slows the solvers down several times, so no peak memory is reported either
+    signal.signal(signal.SIGTERM, stop_solver)
+    metrics = Metrics(lambda metrics: results.put(("progress", metrics.expanded)), PROGRESS_INTERVAL)
+    solution, seconds, _ = measured_solve(board, state, algorithm, trace_memory=False, symmetry=symmetry,
+                                          metrics=metrics, cache=SolutionCache(), incremental=incremental)
+    results.put(("done", solution, seconds, None))
+
+
+def show_hint(board, blocks, table, state):
+    #makes the first move of an optimal solution from state, looked up in the distance table
+    move = table.hint(state)
+    if move is None:
+        print("No move to suggest.")
+        return
+    tile, direction, new_state = move
+    col, row = board.position(state, tile)
+    print(f"Hint: move the tile at column {col}, row {row} {DIRECTION_NAMES[direction]}")
+    place_blocks(board, blocks, new_state)
+
+
+def build_hint_table(board, state, algorithm, symmetry, results, incremental=None):
+    #runs in the solver process in place of solve_in_background when Hint is pressed before the distance table exists
+    started = time.perf_counter()
+    load_distance_table(board).close()
+    results.put(("done", None, time.perf_counter() - started, 0))
+
+
+class BackgroundSolve:
+    #one solve in its own process, so the event loop keeps running at FPS while it searches
+    def __init__(self, board, state, algorithm, symmetry, incremental=None, label="Solving", target=solve_in_background):
+        self.state = state
+        self.label = label #what the status line says the process is doing
+        self.expanded = 0
+        self.started = time.perf_counter()
+        self.results = multiprocessing.Queue()
+        #not a daemon, the parallel solvers start processes of their own
+        self.process = multiprocessing.Process(target=target,
+                                               args=(board, state, algorithm, symmetry, self.results, incremental))
+        self.process.start()
+
+    def poll(self):
+        #None while searching, (solution, seconds, None) once done (the peak memory is not traced). Never blocks
+        while True:
+            try:
+                message = self.results.get_nowait()
+            except queue.Empty:
+                if not self.process.is_alive() and self.results.empty():
+                    return (None, time.perf_counter() - self.started, None) #the solver process died
+                return None
+            if message[0] == "progress":
+                self.expanded = message[1]
+            else:
+                self.process.join()
+                return message[1:]
+
+    def cancel(self):
+        self.process.terminate()
+        self.process.join()
+
+    def status(self):
+        expanded = f"{self.expanded} expanded, " if self.expanded else ""
+        return f"{self.label}... {expanded}{time.perf_counter() - self.started:.1f} s"
+
+
+def main(variant="standard", algorithm="astar", solution=None, solve_on_start=False, symmetry=False, step_delay=0.3):
+    #opens the game window. A solution passed in (or found on start with solve_on_start) belongs to the starting layout,
+    #pressing Solve after the tiles were dragged elsewhere solves again from the position on the screen.
+    #Solving runs in a background process, meanwhile the button cancels it and the tiles stay put.
+    #With astar every solution is remembered, and a position on or near an earlier solution is solved right away.
+    #Hint makes the first move of an optimal solution, looked up in the distance table.
+    #Only what changed is redrawn, and with nothing going on the loop sleeps until the next event
+    layout = LAYOUTS[variant]
+    board, initial_state = make_board(layout)
+    solved_state = initial_state
+
+    pygame.init()
+    screen = pygame.display.set_mode((board.cols * BLOCK_SIZE, board.rows * BLOCK_SIZE))
+    pygame.display.set_caption("Klotski Game")
+    clock = pygame.time.Clock()
+    status_font = pygame.font.Font(None, 24)
+
+    blocks = make_blocks(layout)
+    target_col, target_row = board.target
+    target_width, target_height = board.shapes[0]
+    target_rect = pygame.Rect(target_col * BLOCK_SIZE, target_row * BLOCK_SIZE,
+                              target_width * BLOCK_SIZE, target_height * BLOCK_SIZE)
+
+    cache = SolutionCache()
+    #the solver process works on a copy of incremental, so the window process records every path that comes back
+    incremental = IncrementalSolver(board) if algorithm == "astar" else None
+    hints = None #distance table, loaded on the first press of Hint
+    hint_when_solved = False #Hint was pressed before the table existed, so hint once the solver process built it
+    solving = None #BackgroundSolve while a solver runs
+    play_when_solved = False #Solve was pressed, so show the solution as soon as it arrives
+    playback = [] #states still to show, one every step_delay seconds
+    next_step = 0
+    if solution is None and solve_on_start:
+        solving = BackgroundSolve(board, initial_state, algorithm, symmetry, incremental)
+
+    running = True
+    selected_block = None
+    offset_x, offset_y = 0, 0
+    button_rect = solve_button_rect(screen)
+    hint_rect = hint_button_rect(screen)
+    renderer = Renderer(screen, blocks, target_rect, status_font)
+
+    while running:
+        events = pygame.event.get()
+        if not events and solving is None:
+            #nothing changes before the next event or playback step, so sleep instead of running at FPS
+            timeout = max(1, int((next_step - time.perf_counter()) * 1000)) if playback else 0 #0 waits for good
+            events = [pygame.event.wait(timeout)]
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if button_rect.collidepoint(event.pos): #if solve button is pressed, it simulates the solution
+                    if solving is not None:
+                        solving.cancel()
+                        solving = None
+                        play_when_solved = hint_when_solved = False
+                        print("Solving cancelled.")
+                        continue
+                    current_state = encode_blocks(board, blocks)
+                    if solution is None or current_state != solved_state:
+                        cached = cache.lookup(board, current_state, algorithm, symmetry)
+                        if cached is MISS and incremental is not None and incremental.ready(current_state):
+                            cached = incremental.solve(current_state, limit=LOCAL_EXPANSIONS)
+                            if cached is None: #no solution within the local search, the solver process decides
+                                cached = MISS
+                        if cached is MISS:
+                            solving = BackgroundSolve(board, current_state, algorithm, symmetry, incremental)
+                            play_when_solved = True
+                            continue
+                        print(f"Solution found right away: {len(cached)} moves" if cached is not None
+                              else "No solution found.")
+                        if incremental is not None:
+                            incremental.record(current_state, cached)
+                        solution, solved_state = cached, current_state
+                    if solution:
+                        playback = list(solution)
+                        next_step = time.perf_counter()
+                elif hint_rect.collidepoint(event.pos):
+                    if solving is not None or playback:
+                        continue
+                    current_state = encode_blocks(board, blocks)
+                    if hints is None and not distance_table_saved(board):
+                        #building the table takes seconds, so it is built in the solver process
+                        solving = BackgroundSolve(board, current_state, algorithm, symmetry, label="Building the hint table",
+                                                  target=build_hint_table)
+                        hint_when_solved = True
+                        continue
+                    if hints is None:
+                        hints = load_distance_table(board)
+                    show_hint(board, blocks, hints, current_state)
+                elif solving is None and not playback:
+                    for block in blocks:
+                        if block.rect.collidepoint(event.pos): # mouse click on block, mark as dragging
+                            selected_block = block
+                            #offset = horizontal difference and vertical difference between mouse position and tile's top-left
+                            offset_x, offset_y = event.pos[0] - block.rect.x, event.pos[1] - block.rect.y
+                            block.dragging = True
+
+                            break
+            elif event.type == pygame.MOUSEBUTTONUP: #if release unmark dragging
+                if selected_block:
+                    selected_block.dragging = False
+                    selected_block = None
+
+            elif event.type == pygame.MOUSEMOTION:
+                if selected_block and selected_block.dragging:
+                    new_x = event.pos[0] - offset_x #calculate new X base on mouse movement
+                    new_y = event.pos[1] - offset_y #calculate new Y base on mouse movement
+
+                    new_x = round(new_x / BLOCK_SIZE) * BLOCK_SIZE #round to cloest tile size
+                    new_y = round(new_y / BLOCK_SIZE) * BLOCK_SIZE
+
+                    old_x, old_y = selected_block.rect.x, selected_block.rect.y #save old position in case collision occurs
+
+                    selected_block.rect.x = new_x
+                    selected_block.rect.y = new_y
+
+                    if not screen.get_rect().contains(selected_block.rect): #check if tile out of boundaries
+                        selected_block.rect.x = old_x
+                        selected_block.rect.y = old_y
+
+                    if board.collides(encode_blocks(board, blocks), blocks.index(selected_block)):
+                        #check if dragging tile collide with any tlies
+                        selected_block.rect.x = old_x
+                        selected_block.rect.y = old_y
+
+        if solving is not None:
+            result = solving.poll()
+            if result is not None and hint_when_solved:
+                if distance_table_saved(board):
+                    hints = load_distance_table(board)
+                    show_hint(board, blocks, hints, solving.state)
+                else:
+                    print("No move to suggest.") #the build failed
+                solving = None
+                hint_when_solved = False
+            elif result is not None:
+                solution, seconds, peak = result
+                solved_state = solving.state
+                if incremental is not None:
+                    incremental.record(solved_state, solution)
+                solving = None
+                report(solution, seconds, peak)
+                if solution and play_when_solved:
+                    playback = list(solution)
+                    next_step = time.perf_counter()
+                play_when_solved = False
+
+        # Visualize the solution by simulating the path, one move every step_delay without stopping the event loop
+        if playback and time.perf_counter() >= next_step:
+            place_blocks(board, blocks, playback.pop(0))
+            next_step += step_delay
+
+        renderer.set_status(solving.status() if solving is not None else None)
+        renderer.set_solve_label("Solve" if solving is None else "Cancel")
+        renderer.paint()
+        clock.tick(FPS)
+
+        # Check win condition
+        if board.is_goal(encode_blocks(board, blocks)):
+            print("You win!")
+            running = False
+
+    if solving is not None:
+        solving.cancel()
+    if hints is not None:
+        hints.close()
+    pygame.quit()
+    sys.exit()
@@ -0,0 +1,183 @@
+# HDA*: A* spread over several processes by hashing states to owners.
+#
+# Every worker runs A* with its own open list, best g and parents over the canonical keys it owns
+# (key_hash(key) % workers, as in parallel_bfs). Successors owned by another worker are batched and put on that
+# worker's inbox queue without waiting for an answer. The cheapest goal found so far (the incumbent) is shared,
+# and each worker prunes every open entry whose f is not below it.
+#
+# Termination: a worker with nothing below the incumbent marks itself idle. Receiving a batch clears the flag again.
+# A sent counter is raised before every put and a received counter after every get, all under one lock.
+# When every worker is idle and the two counters are equal, no batch is in flight and no open list holds an f below
+# the incumbent. So with an admissible heuristic the incumbent is as cheap as the serial astar_solver result.
+import heapq
+import os
+import queue
+from multiprocessing import Lock, Pipe, Process, Queue, parent_process
+from multiprocessing.sharedctypes import RawArray, RawValue
+
+from klotski.bitboard import key_hash
+from klotski.parallel_bfs import RemoteParents, receive
+from klotski.pattern_db import load_pattern_db
+from klotski.solvers import reconstruct_path, state_key_function
+
+NO_SOLUTION = 1 << 62 #incumbent cost before any goal is found
+EXPANSIONS_PER_ROUND = 64 #states expanded between two flushes of the outgoing batches
+
+
+class Shared:
+    #the state every worker sees, all writes under lock
+    def __init__(self, workers):
+        self.lock = Lock()
+        self.incumbent = RawValue("q", NO_SOLUTION) #cost of the best goal found so far
+        self.owner = RawValue("i", -1) #worker holding that goal
+        self.sent = RawValue("q", 0)
+        self.received = RawValue("q", 0)
+        self.idle = RawArray("b", workers)
+        self.done = RawValue("b", 0)
+
+
+def hda_worker(board, symmetry, heuristic, index, inboxes, shared, connection):
+    if heuristic is None:
+        heuristic = load_pattern_db(board).heuristic
+    key = state_key_function(board, symmetry)
+    workers = len(inboxes)
+    inbox = inboxes[index]
+    open_set = [] #f(n), -g(n), state
+    best_g = {}
+    parents = {} #canonical key -> (parent state, (tile index, direction)), None for the initial state
+    outgoing = [[] for _ in range(workers)]
+    goal = None
+    counts = [0, 0, 0, 0, 0] #expanded, generated, pushed, largest open list, deepest g, sent to the coordinator at the end
+
+    def relax(state, g, parent):
+        state_key = key(state)
+        if g < best_g.get(state_key, g + 1):
+            best_g[state_key] = g
+            parents[state_key] = parent
+            heapq.heappush(open_set, (g + heuristic(state), -g, state))
+            counts[2] += 1
+
+    def has_work():
+        return open_set and open_set[0][0] < shared.incumbent.value
+
+    coordinator = parent_process()
+    while not shared.done.value:
+        if not coordinator.is_alive(): #the coordinator was killed, nobody will ever set done
+            break
+        # take every waiting batch, waiting a little for one when there is nothing else to do
+        try:
+            while True:
+                batch = inbox.get_nowait() if has_work() else inbox.get(timeout=0.01)
+                with shared.lock:
+                    shared.received.value += 1
+                    shared.idle[index] = 0
+                for state, g, parent in batch:
+                    relax(state, g, parent)
+        except queue.Empty:
+            pass
+
+        for _ in range(EXPANSIONS_PER_ROUND):
+            if not has_work():
+                break
+            f, g, state = heapq.heappop(open_set)
+            g = -g
+            # a cheaper way to this state was found after this entry was pushed. Unlike astar_solver there is no closed
+            # set: the workers do not expand in one global order of f, so a batch can still bring a cheaper way to a
+            # state that was expanded already, and relax re-opens it
+            if g > best_g[key(state)]:
+                continue
+
+            if board.is_goal(state):
+                with shared.lock:
+                    if g < shared.incumbent.value:
+                        shared.incumbent.value = g
+                        shared.owner.value = index
+                        goal = state
+                continue
+
+            moves = board.moves(state)
+            counts[0] += 1
+            counts[1] += len(moves)
+            counts[3] = max(counts[3], len(open_set))
+            counts[4] = max(counts[4], g)
+            for tile, direction, neighbor in moves:
+                owner = key_hash(key(neighbor)) % workers
+                if owner == index:
+                    relax(neighbor, g + 1, (state, (tile, direction)))
+                else:
+                    outgoing[owner].append((neighbor, g + 1, (state, (tile, direction))))
+
+        for owner, batch in enumerate(outgoing):
+            if batch:
+                with shared.lock:
+                    shared.sent.value += 1 #before the put, so received never catches up while it is in flight
+                inboxes[owner].put(batch)
+                outgoing[owner] = []
+
+        if not has_work():
+            with shared.lock:
+                shared.idle[index] = 1
+                if all(shared.idle) and shared.sent.value == shared.received.value:
+                    shared.done.value = 1
+
+    # searching is over, answer the path questions of the coordinator. Batches left in the queues only exist when
+    # the coordinator stopped the search early, so do not wait for them to be flushed on exit
+    for other in inboxes:
+        other.cancel_join_thread()
+    connection.send(counts)
+    while True:
+        message = receive(connection)
+        if message[0] == "parent":
+            connection.send(parents[message[1]])
+        elif message[0] == "goal":
+            connection.send(goal)
+        else: #"stop"
+            connection.close()
+            return
+
+
+def hda_star(board, initial_state, workers=None, symmetry=False, heuristic=None, metrics=None):
+    # optimal like astar_solver with an admissible heuristic (default: the pattern database of the board), with the
+    # open lists spread over workers processes (default: one per core).
+    # metrics, when given, gets the totals of all workers once the search is over (max_frontier is the largest single
+    # open list), see klotski/metrics.py
+    if board.is_goal(initial_state):
+        return []
+    if heuristic is None:
+        load_pattern_db(board) #built here once, the workers load it from the cache
+    workers = workers or os.cpu_count() or 1
+    key = state_key_function(board, symmetry)
+
+    shared = Shared(workers)
+    inboxes = [Queue() for _ in range(workers)]
+    shared.sent.value = 1 #the seed counts as sent before any worker can find everything idle
+    inboxes[key_hash(key(initial_state)) % workers].put([(initial_state, 0, None)])
+    connections = []
+    processes = []
+    for index in range(workers):
+        connection, worker_connection = Pipe()
+        process = Process(target=hda_worker, args=(board, symmetry, heuristic, index, inboxes, shared, worker_connection),
+                          daemon=True)
+        process.start()
+        worker_connection.close()
+        connections.append(connection)
+        processes.append(process)
+
+    try:
+        counts = [connection.recv() for connection in connections]
+        if metrics is not None:
+            metrics.update(sum(count[1] for count in counts), sum(count[2] for count in counts),
+                           max(count[3] for count in counts), max(count[4] for count in counts),
+                           sum(count[0] for count in counts))
+        if shared.owner.value < 0:
+            return None
+        connection = connections[shared.owner.value]
+        connection.send(("goal",))
+        return reconstruct_path(board, RemoteParents(connections), connection.recv(), key)
+    finally:
+        shared.done.value = 1 #stops the workers early when the coordinator fails
+        for connection in connections:
+            connection.send(("stop",))
+            connection.close()
+        for process in processes:
+            process.join()
@@ -0,0 +1,37 @@
+# Heuristics in grid units. Every move slides one piece by one cell and costs 1,
+# so each function below is a lower bound on the moves left and A* stays optimal with them.
+# They need no table at all, where the pattern database (klotski/pattern_db.py) takes seconds to build the first time
+# but expands far fewer states. klotski-solve --heuristic picks one of the two for astar, ida and hda.
+from functools import partial
+
+from klotski.pattern_db import load_pattern_db
+
+HEURISTICS = ["pdb", "grid"]
+
+def manhattan(board, state):
+    # the target block moves at most one cell per move
+    col, row = board.position(state, 0)
+    return abs(col - board.target[0]) + abs(row - board.target[1])
+
+
+def blockers(board, state):
+    # every other piece covering part of the goal area has to leave it, which takes at least one move of that piece
+    goal_mask = board.goal_mask
+    masks = board.masks(state)
+    return sum(1 for mask in masks[1:] if mask & goal_mask)
+
+
+def admissible(board, state):
+    # target moves and blocker moves are moves of different pieces, so the two bounds add up.
+    # A move changes the sum by at most one, which keeps it consistent as well
+    return manhattan(board, state) + blockers(board, state)
+
+
+def load_heuristic(board, name="pdb"):
+    # the heuristic called name (one of HEURISTICS) as a function of a state, what solve(heuristic=...) takes.
+    # A partial of a module function, so hda can pass it to its worker processes
+    if name == "grid":
+        return partial(admissible, board)
+    if name == "pdb":
+        return load_pattern_db(board).heuristic
+    raise ValueError(f"unknown heuristic {name!r}, expected one of {', '.join(HEURISTICS)}")
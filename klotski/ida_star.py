@@ -0,0 +1,78 @@
+# IDA*: depth-first searches under a growing f = g + h bound.
+#
+# Memory is the current path plus a transposition table with a fixed number of slots, so the ceiling is set by
+# table_size instead of by how many states the puzzle has. A slot holds (key, learned h, g, iteration) for the
+# last state hashed to it; a colliding state simply replaces it, which only costs re-searching, never optimality.
+from klotski.bitboard import key_hash
+
+INFINITY = float("inf")
+
+
+def ida_star(board, initial_state, heuristic, table_size=1 << 16, metrics=None):
+    # optimal whenever heuristic is admissible, memory is O(solution depth + table_size).
+    # metrics, when given, counts the states expanded over all iterations, see klotski/metrics.py
+    if board.is_goal(initial_state):
+        return []
+    table = [None] * table_size
+    path = [initial_state]
+    on_path = set()
+    cut = False #whether the current iteration left out any state for having f over the bound
+
+    def search(state, state_key, h, g, bound, iteration):
+        # returns True with the goal at the end of path, or a lower bound on the f of any solution below state.
+        # h is heuristic(state), which the parent already needed to order its children
+        nonlocal cut
+        slot = key_hash(state_key) % table_size
+        entry = table[slot]
+        if entry is not None and entry[0] == state_key:
+            # a failed search below this state proved it is at least entry[1] moves from the goal
+            h = max(h, entry[1])
+            if entry[3] == iteration and entry[2] <= g:
+                # already searched this iteration with at least as much of the bound left
+                return g + h
+        f = g + h
+        if f > bound:
+            cut = True
+            return f
+        if board.is_goal(state):
+            return True
+
+        on_path.add(state_key)
+        minimum = INFINITY
+        # most promising children first, so the last iteration tends to hit the goal early
+        children = sorted((heuristic(n), n) for n in board.neighbors(state))
+        if metrics is not None:
+            new = sum(1 for _, child in children if board.key(child) not in on_path)
+            metrics.update(len(children), new, len(path), g)
+        for child_h, child in children:
+            child_key = board.key(child)
+            if child_key in on_path:
+                # going back up the path is never shorter, but still bound it by the child's own estimate so the
+                # learned h below stays admissible
+                minimum = min(minimum, g + 1 + child_h)
+                continue
+            path.append(child)
+            result = search(child, child_key, child_h, g + 1, bound, iteration)
+            if result is True:
+                return True
+            path.pop()
+            minimum = min(minimum, result)
+        on_path.discard(state_key)
+
+        table[slot] = (state_key, minimum - g, g, iteration)
+        return minimum
+
+    bound = heuristic(initial_state)
+    iteration = 0
+    while bound < INFINITY:
+        iteration += 1
+        cut = False
+        result = search(initial_state, board.key(initial_state), bound, 0, bound, iteration)
+        if result is True:
+            return board.relabel_path(path[1:], initial_state)
+        if not cut:
+            # every state reachable from the start was searched, so raising the bound finds nothing new
+            return None
+        # unit move costs and no solution of cost <= bound, so the next bound is at least bound + 1
+        bound = max(result, bound + 1)
+    return None
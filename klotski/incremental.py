@@ -0,0 +1,96 @@
+# A* that keeps what earlier solves of the same board found, for solving again and again during play.
+#
+# Every state on a returned path is stored with its exact number of moves to the goal and the state one move
+# closer (every part of an optimal path is optimal). A new search treats a stored state like a goal that costs its
+# distance: its entry goes on the open list with f = g + distance and is never expanded. All other entries have
+# f = g + h with a consistent h, so the first stored state or goal popped ends a path as short as a fresh
+# astar_solver's. A position on an earlier path needs no search at all, one a few moves off it only a few
+# expansions, and each answer adds its own path to what is stored.
+import heapq
+
+from klotski.pattern_db import load_pattern_db, pattern_db_saved
+from klotski.solvers import reconstruct_path
+
+
+class IncrementalSolver:
+    def __init__(self, board, heuristic=None):
+        # heuristic: consistent estimate of the moves left (default: the pattern database of the board)
+        self.board = board
+        self.heuristic = heuristic
+        self.distance = {} #canonical key -> exact moves to the goal
+        self.next = {} #canonical key -> the state one move closer to the goal, under some labelling
+
+    def known(self, state):
+        return self.board.is_goal(state) or self.board.key(state) in self.distance
+
+    def ready(self, state):
+        # whether solving state starts right away: it is known, or the heuristic is loaded or at least on disk.
+        # Otherwise the first solve builds the pattern database, which takes seconds
+        return self.known(state) or self.heuristic is not None or pattern_db_saved(self.board)
+
+    def follow(self, state):
+        # the stored optimal path from a known state, under state's piece indices
+        board = self.board
+        path = []
+        current = state
+        while not board.is_goal(current):
+            current = self.next[board.key(current)]
+            path.append(current)
+        return board.relabel_path(path, state)
+
+    def record(self, state, solution):
+        # stores the distance and next state of every state on solution, an optimal path from state
+        if solution is None:
+            return
+        path = [state] + list(solution)
+        for moves_left, (current, following) in enumerate(zip(path, path[1:]), 1):
+            self.distance[self.board.key(current)] = len(path) - moves_left
+            self.next[self.board.key(current)] = following
+
+    def solve(self, initial_state, metrics=None, limit=None):
+        # optimal path from initial_state like astar_solver, or None when there is none or when limit expansions
+        # were not enough. metrics, when given, is counted into like the other solvers, see klotski/metrics.py
+        board = self.board
+        if self.known(initial_state):
+            return self.follow(initial_state)
+        if self.heuristic is None:
+            self.heuristic = load_pattern_db(board).heuristic
+        heuristic, distance, key = self.heuristic, self.distance, board.key
+
+        open_set = [(heuristic(initial_state), 0, 1, initial_state)] #f(n), -g(n), 0 for a stored state, state
+        best_g = {key(initial_state): 0}
+        parents = {key(initial_state): None}
+        closed = set() #expanded keys, as in astar_solver
+        expanded = 0
+        while open_set:
+            f, g, open_node, current_state = heapq.heappop(open_set)
+            g = -g
+            current_key = key(current_state)
+            if current_key in closed:
+                continue
+            closed.add(current_key)
+            if not open_node:
+                solution = reconstruct_path(board, parents, current_state, key)
+                solution += self.follow(solution[-1] if solution else initial_state)
+                self.record(initial_state, solution)
+                return solution
+            if limit is not None and expanded >= limit:
+                return None
+
+            opened = len(open_set)
+            moves = board.moves(current_state)
+            for tile, direction, neighbor in moves:
+                neighbor_key = key(neighbor)
+                if neighbor_key not in closed and g + 1 < best_g.get(neighbor_key, g + 2):
+                    best_g[neighbor_key] = g + 1
+                    parents[neighbor_key] = (current_state, (tile, direction))
+                    if board.is_goal(neighbor):
+                        heapq.heappush(open_set, (g + 1, -(g + 1), 0, neighbor))
+                    elif neighbor_key in distance:
+                        heapq.heappush(open_set, (g + 1 + distance[neighbor_key], -(g + 1), 0, neighbor))
+                    else:
+                        heapq.heappush(open_set, (g + 1 + heuristic(neighbor), -(g + 1), 1, neighbor))
+            expanded += 1
+            if metrics is not None:
+                metrics.update(len(moves), len(open_set) - opened, len(open_set), g)
+        return None
@@ -0,0 +1,85 @@
+# Starting layouts of the puzzles, every block as (col, row, width, height) in cells.
+# The first block is the one that has to reach the target, the other blocks keep the order of BLOCK_COLORS in the GUI.
+from klotski.bitboard import Board
+
+COLS = 4
+ROWS = 5
+TARGET = (1, 3) #top-left cell the first block has to reach
+
+STANDARD_KLOTSKI = [
+    (1, 0, 2, 2), # Target block
+    (0, 0, 1, 2),
+    (3, 0, 1, 2),
+    (1, 2, 1, 1),
+    (2, 2, 1, 1),
+    (0, 2, 1, 1),
+    (3, 2, 1, 1),
+    (0, 3, 1, 2),
+    (3, 3, 1, 2),
+    (1, 4, 1, 1),
+    (2, 4, 1, 1)
+]
+
+# looks the same as the standard puzzle, but the tile sequence is different
+VARIANT_KLOTSKI = [
+    (1, 0, 2, 2), # Target block
+    (0, 0, 1, 2), # Block 1
+    (3, 0, 1, 2), # Block 2
+    (0, 2, 1, 1), # Block 3
+    (3, 2, 1, 1), # Block 4
+    (1, 2, 1, 1), # Block 5
+    (2, 2, 1, 1), # Block 6
+    (0, 3, 1, 2), # Block 7
+    (3, 3, 1, 2), # Block 8
+    (1, 4, 1, 1), # Block 9
+    (2, 4, 1, 1)  # Block 10
+]
+
+LAYOUTS = {
+    "standard": STANDARD_KLOTSKI,
+    "variant": VARIANT_KLOTSKI
+}
+
+
+def is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def check_target(layout, cols=COLS, rows=ROWS, target=TARGET):
+    #raises ValueError unless target is a (col, row) where the first block fits on the board
+    if not isinstance(target, (list, tuple)) or len(target) != 2 or not all(is_int(value) for value in target):
+        raise ValueError(f"target {target!r} is not a (col, row) pair of ints")
+    col, row = target
+    _, _, width, height = layout[0]
+    if col < 0 or row < 0 or col + width > cols or row + height > rows:
+        raise ValueError(f"the {width}x{height} target block cannot reach {tuple(target)} on the {cols}x{rows} board")
+
+
+def check_layout(layout, cols=COLS, rows=ROWS, target=None):
+    #raises ValueError when a block is not four ints, a block leaves the board or two blocks overlap,
+    #and with a target when the first block cannot reach it
+    if not layout:
+        raise ValueError("the layout has no blocks")
+    covered = set()
+    for block in layout:
+        if not isinstance(block, (list, tuple)) or len(block) != 4 or not all(is_int(value) for value in block):
+            raise ValueError(f"block {block!r} is not four ints (col, row, width, height)")
+        col, row, width, height = block
+        if width < 1 or height < 1:
+            raise ValueError(f"block {tuple(block)} has no cells")
+        if col < 0 or row < 0 or col + width > cols or row + height > rows:
+            raise ValueError(f"block {(col, row, width, height)} leaves the {cols}x{rows} board")
+        cells = {(c, r) for c in range(col, col + width) for r in range(row, row + height)}
+        if cells & covered:
+            raise ValueError(f"block {(col, row, width, height)} overlaps another block")
+        covered |= cells
+    if target is not None:
+        check_target(layout, cols, rows, target)
+
+
+def make_board(layout, cols=COLS, rows=ROWS, target=TARGET):
+    #bitboard of a layout and its starting state. A target the first block cannot reach raises ValueError,
+    #the search would otherwise go through every state before it reported no solution
+    check_target(layout, cols, rows, target)
+    board = Board([(width, height) for _, _, width, height in layout], cols, rows, target)
+    return board, board.encode([(col, row) for col, row, _, _ in layout])
@@ -0,0 +1,92 @@
+# Counters a solver fills while it runs, and a throttled report of them.
+#
+# Every solver takes metrics=None. With None it does no counting at all, otherwise it calls metrics.update once per
+# expanded state (or once per level for the level-synchronous solvers). The clock is only read every CHECK_EVERY
+# updates, and report(metrics) is called at most once per interval seconds, plus once more from finish().
+import logging
+import time
+
+CHECK_EVERY = 1024 #updates between two reads of the clock
+
+logger = logging.getLogger("klotski")
+
+
+def log_metrics(metrics):
+    #default report, one line on the "klotski" logger
+    logger.info("%s", metrics)
+
+
+class Metrics:
+    def __init__(self, report=None, interval=1.0):
+        self.report = report
+        self.interval = interval
+        self.expanded = 0 #states whose successors were generated
+        self.generated = 0 #successors generated
+        self.duplicates = 0 #successors dropped because their key was already reached as cheaply
+        self.max_frontier = 0 #largest queue, stack, open list or level seen
+        self.depth = 0 #deepest g reached
+        self.started = time.perf_counter()
+        self.finished = None
+        self.next_report = self.started + interval
+        self.countdown = CHECK_EVERY
+        self.reported = None #expanded count at the last report
+
+    def update(self, generated, new, frontier, depth, expanded=1):
+        #expanded states that generated successors, new of which were kept, with the frontier size and depth after it
+        self.expanded += expanded
+        self.generated += generated
+        self.duplicates += generated - new
+        if frontier > self.max_frontier:
+            self.max_frontier = frontier
+        if depth > self.depth:
+            self.depth = depth
+        self.countdown -= expanded
+        if self.countdown <= 0:
+            self.countdown = CHECK_EVERY
+            self.poll()
+
+    def poll(self):
+        if self.report is None:
+            return
+        now = time.perf_counter()
+        if now >= self.next_report:
+            self.next_report = now + self.interval
+            self.reported = self.expanded
+            self.report(self)
+
+    def finish(self):
+        self.finished = time.perf_counter()
+        if self.report is not None and self.reported != self.expanded: #not twice for the same counts
+            self.report(self)
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def rate(self):
+        #expanded states per second
+        elapsed = self.elapsed
+        return self.expanded / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def branching_factor(self):
+        #mean successors per expanded state
+        return self.generated / self.expanded if self.expanded else 0.0
+
+    def as_dict(self):
+        return {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "duplicates": self.duplicates,
+            "max_frontier": self.max_frontier,
+            "depth": self.depth,
+            "seconds": round(self.elapsed, 6),
+            "rate": round(self.rate, 1),
+            "branching_factor": round(self.branching_factor, 3)
+        }
+
+    def __str__(self):
+        return (f"expanded {self.expanded} ({self.rate:.0f}/s), generated {self.generated}, "
+                f"duplicates {self.duplicates}, branching {self.branching_factor:.2f}, "
+                f"max frontier {self.max_frontier}, depth {self.depth}, {self.elapsed:.2f} s")
@@ -0,0 +1,120 @@
+# Level-synchronous BFS with every level expanded at once by NumPy.
+#
+# A level is a sorted uint64 array of packed keys: the top-left cell of every piece in its bits-wide field, with
+# the cells of identical pieces sorted so that swapping them gives the same key (with symmetry, the smaller key of
+# a state and its mirror). Expanding a level unpacks it into one column of cells per piece and builds the occupancy
+# masks of all its states. Then every (piece, direction) pair is one vectorised step: look up the cells the slide
+# enters, keep the rows where they are free, move the piece and pack the new keys. The successors are deduplicated
+# with np.unique and set-subtracted from the current and the previous level (slides are reversible, so no other
+# level can hold them). The interpreter does a fixed amount of work per level and per piece, not per state.
+# The levels are kept to find the path backwards from the goal, one binary search per move.
+import numpy as np
+
+from klotski.bitboard import DIRECTIONS
+from klotski.solvers import state_key_function
+
+
+class Packing:
+    # the board's move tables as arrays and the packed keys of cell columns
+    def __init__(self, board, symmetry):
+        if board.bits * len(board.shapes) > 64 or board.cells > 64:
+            raise ValueError("the numpy solver packs a state into 64 bits, the board is too big for it")
+        state_key_function(board, symmetry) #the same check for a goal that is not its own mirror image
+        self.board = board
+        self.symmetry = symmetry
+        self.shifts = np.array([board.bits * i for i in range(len(board.shapes))], dtype=np.uint64)
+        self.covers = np.array(board.covers, dtype=np.uint64)
+        self.mirror_cells = np.array(board.mirror_cells, dtype=np.uint8)
+        # entered[i, cell, direction]: cells the slide enters, all cells when piece i on cell cannot slide that way
+        self.entered = np.full((len(board.shapes), board.cells, len(DIRECTIONS)), board.cells_mask, dtype=np.uint64)
+        for i, table in enumerate(board.slide_tables):
+            for cell, slides in enumerate(table):
+                for direction, slide in enumerate(slides):
+                    if slide is not None:
+                        self.entered[i, cell, direction] = slide[0]
+        self.steps = [dx + dy * board.cols for dx, dy in DIRECTIONS]
+
+    def canonical(self, cells):
+        # cells with the columns of every group of identical pieces sorted per row
+        cells = cells.copy()
+        for group in self.board.groups:
+            if len(group) > 1:
+                cells[:, group] = np.sort(cells[:, group], axis=1)
+        return cells
+
+    def pack(self, cells):
+        keys = (self.canonical(cells).astype(np.uint64) << self.shifts).sum(axis=1, dtype=np.uint64)
+        if self.symmetry:
+            mirrored = self.mirror_cells[np.arange(cells.shape[1]), cells]
+            mirrored_keys = (self.canonical(mirrored).astype(np.uint64) << self.shifts).sum(axis=1, dtype=np.uint64)
+            keys = np.minimum(keys, mirrored_keys)
+        return keys
+
+    def unpack(self, keys):
+        return ((keys[:, None] >> self.shifts) & np.uint64(self.board.field)).astype(np.intp)
+
+    def key(self, state):
+        return int(self.pack(np.array([self.board.cells_of(state)], dtype=np.intp))[0])
+
+    def expand(self, keys):
+        # the unique keys of every successor of the states of keys, and how many successors there were
+        cells = self.unpack(keys)
+        rows = np.arange(len(keys))
+        occupancy = np.zeros(len(keys), dtype=np.uint64)
+        for i in range(cells.shape[1]):
+            occupancy |= self.covers[i][cells[:, i]]
+        successors = []
+        for i in range(cells.shape[1]):
+            for direction, step in enumerate(self.steps):
+                legal = (self.entered[i, cells[:, i], direction] & occupancy) == 0
+                if not legal.any():
+                    continue
+                moved = cells[rows[legal]]
+                moved[:, i] += step
+                successors.append(self.pack(moved))
+        if not successors:
+            return np.empty(0, dtype=np.uint64), 0
+        successors = np.concatenate(successors)
+        return np.unique(successors), len(successors)
+
+
+def trace_back(board, packing, levels, goal, initial_state):
+    # the states after every move from initial_state to goal, which lies on the last level. Each step takes a
+    # neighbour of the current state whose key is on the level before, so the path is made of concrete neighbours
+    path = [goal]
+    state = goal
+    for level in reversed(levels[:-1]):
+        for neighbor in board.neighbors(state):
+            neighbor_key = packing.key(neighbor)
+            index = np.searchsorted(level, neighbor_key)
+            if index < len(level) and level[index] == neighbor_key:
+                state = neighbor
+                break
+        path.append(state)
+    path.reverse()
+    # with symmetry the walk can end on the mirror of the initial state, then the whole path is its mirror image
+    if board.key(path[0]) != board.key(initial_state):
+        path = [board.mirror(state) for state in path]
+    return board.relabel_path(path[1:], initial_state)
+
+
+def numpy_bfs(board, initial_state, symmetry=False, metrics=None):
+    # optimal like bfs_solver. metrics, when given, is updated once per level, see klotski/metrics.py
+    if board.is_goal(initial_state):
+        return []
+    packing = Packing(board, symmetry)
+    levels = [np.array([packing.key(initial_state)], dtype=np.uint64)]
+    previous = np.empty(0, dtype=np.uint64)
+    while len(levels[-1]):
+        successors, generated = packing.expand(levels[-1])
+        level = np.setdiff1d(np.setdiff1d(successors, levels[-1], assume_unique=True), previous, assume_unique=True)
+        previous = levels[-1]
+        levels.append(level)
+        if metrics is not None:
+            metrics.update(generated, len(level), len(level), len(levels) - 1, len(previous))
+
+        goals = np.flatnonzero(packing.unpack(level)[:, 0] == board.target_cell)
+        if len(goals):
+            cells = packing.unpack(level[goals[:1]])[0]
+            return trace_back(board, packing, levels, board.pack(cells.tolist()), initial_state)
+    return None
@@ -0,0 +1,152 @@
+# Level-synchronous BFS over several processes.
+#
+# Every worker owns the states whose canonical key hashes to its index (key_hash(key) % workers): their parents
+# and the part of the current level made of them. A parent is stored as the move code of the slide that reached the
+# state (Board.move_code), so a batch carries each new state and one small int. On "expand" every worker expands its
+# part of the level and puts one batch on the inbox queue of every other worker, an empty one too, so it knows to
+# wait for exactly workers - 1 batches. It merges those and its own batch, drops the keys it already holds and keeps
+# the rest as its part of the next level. Then it tells the coordinator the size of that part and any goal in it.
+# The coordinator only sees those replies: it starts no level before every worker answered for the last one, so the
+# first level holding a goal state gives an optimal path, as in bfs_solver.
+import os
+import queue
+from multiprocessing import Pipe, Process, Queue, parent_process
+
+from klotski.bitboard import key_hash
+from klotski.solvers import reconstruct_moves, state_key_function
+
+PARENT_CHECK = 0.5 #seconds a waiting worker goes between two checks that its coordinator still runs
+
+
+def receive(connection):
+    #connection.recv for a worker, or ("stop",) once the process that started it is gone. A forked worker holds a copy
+    #of the coordinator's end of its pipe, so the pipe never breaks when the coordinator is killed
+    parent = parent_process()
+    while not connection.poll(PARENT_CHECK):
+        if parent is not None and not parent.is_alive():
+            return ("stop",)
+    return connection.recv()
+
+
+def receive_batch(inbox):
+    #the next batch on a worker's inbox, or None once the process that started it is gone
+    parent = parent_process()
+    while True:
+        try:
+            return inbox.get(timeout=PARENT_CHECK)
+        except queue.Empty:
+            if parent is not None and not parent.is_alive():
+                return None
+
+
+def bfs_worker(board, symmetry, index, inboxes, connection):
+    key = state_key_function(board, symmetry)
+    workers = len(inboxes)
+    parents = {} #canonical key -> move code + 1 of the slide that reached it (0 for the initial state), owned keys only
+    frontier = [] #owned states of the level being built
+
+    def insert(batch):
+        #adds the new states of batch to the next level, returns a goal among them or None
+        goal = None
+        for state, code in batch:
+            state_key = key(state)
+            if state_key not in parents:
+                parents[state_key] = code
+                frontier.append(state)
+                if goal is None and board.is_goal(state):
+                    goal = state
+        return goal
+
+    while True:
+        message = receive(connection)
+        command = message[0]
+        if command == "insert":
+            goal = insert(message[1])
+            connection.send((len(frontier), goal, 0))
+        elif command == "expand":
+            batches = [{} for _ in range(workers)] #one per owner, by key so a state is shipped once per level
+            generated = 0
+            for state in frontier:
+                moves = board.moves(state)
+                generated += len(moves)
+                for tile, direction, neighbor in moves:
+                    neighbor_key = key(neighbor)
+                    owner = key_hash(neighbor_key) % workers
+                    if neighbor_key in batches[owner] or (owner == index and neighbor_key in parents):
+                        continue
+                    batches[owner][neighbor_key] = (neighbor, board.move_code(neighbor, tile, direction) + 1)
+            frontier = []
+            for owner, batch in enumerate(batches):
+                if owner != index:
+                    inboxes[owner].put(list(batch.values()))
+            goals = [insert(batches[index].values())]
+            for _ in range(workers - 1):
+                batch = receive_batch(inboxes[index])
+                if batch is None: #the coordinator is gone
+                    return
+                goals.append(insert(batch))
+            goal = next((goal for goal in goals if goal is not None), None)
+            connection.send((len(frontier), goal, generated))
+        elif command == "parent":
+            connection.send(parents[message[1]])
+        else: #"stop"
+            for inbox in inboxes: #a stop in the middle of a level can leave batches nobody reads
+                inbox.cancel_join_thread()
+            connection.close()
+            return
+
+
+class RemoteParents:
+    #the parents of all workers seen as one mapping, enough for reconstruct_path (reconstruct_moves in parallel_bfs)
+    def __init__(self, connections):
+        self.connections = connections
+
+    def __getitem__(self, state_key):
+        connection = self.connections[key_hash(state_key) % len(self.connections)]
+        connection.send(("parent", state_key))
+        return connection.recv()
+
+
+def parallel_bfs(board, initial_state, workers=None, symmetry=False, metrics=None):
+    # optimal like bfs_solver, with the visited set split over workers processes (default: one per core).
+    # metrics, when given, is updated once per level, see klotski/metrics.py
+    if board.is_goal(initial_state):
+        return []
+    workers = workers or os.cpu_count() or 1
+    key = state_key_function(board, symmetry)
+
+    inboxes = [Queue() for _ in range(workers)]
+    connections = []
+    processes = []
+    for index in range(workers):
+        connection, worker_connection = Pipe()
+        process = Process(target=bfs_worker, args=(board, symmetry, index, inboxes, worker_connection), daemon=True)
+        process.start()
+        worker_connection.close()
+        connections.append(connection)
+        processes.append(process)
+
+    try:
+        connections[key_hash(key(initial_state)) % workers].send(("insert", [(initial_state, 0)]))
+        level = connections[key_hash(key(initial_state)) % workers].recv()[0]
+        depth = 0
+        while level:
+            for connection in connections:
+                connection.send(("expand",))
+            results = [connection.recv() for connection in connections] #the level barrier
+
+            expanded = level
+            level = sum(size for size, _, _ in results)
+            depth += 1
+            if metrics is not None:
+                metrics.update(sum(generated for _, _, generated in results), level, level, depth, expanded)
+            for _, goal, _ in results:
+                if goal is not None:
+                    return reconstruct_moves(board, RemoteParents(connections), goal, key, initial_state)
+        return None
+    finally:
+        for connection in connections:
+            connection.send(("stop",))
+            connection.close()
+        for process in processes:
+            process.join()
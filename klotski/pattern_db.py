@@ -0,0 +1,145 @@
+# Pattern database heuristic.
+#
+# The board is abstracted to the pattern pieces only, the other pieces are taken off the board.
+# A retrograde BFS from every abstract goal state gives the exact number of moves left for every abstract board,
+# stored as one byte per perfectly ranked abstract state (Board.rank of the abstract board).
+# Taking pieces off only frees cells, so the table never overestimates the moves of the pattern pieces.
+# Which of two identical pieces is taken off is only a matter of labels, so the heuristic is the largest estimate over
+# every choice of the identical pieces to keep. It then depends on the canonical key of a state alone, and it is
+# consistent: one move changes every single estimate by at most one, and so their maximum.
+# That maximum takes a rank walk per choice (15 on the 4x5 boards), so every estimate is memoised by canonical key
+# and a state seen before costs one Board.key and one dict lookup.
+import os
+from array import array
+from collections import deque
+from itertools import combinations
+
+from klotski.bitboard import Board
+from klotski.storage import board_signature, cache_path
+
+UNREACHED = 255
+MEMO_LIMIT = 1 << 20 #estimates kept by canonical key, the memo starts over when it is full so memory stays bounded
+
+
+def default_pattern(board):
+    # every piece except two of the 1x1 blocks: the abstract board then has two extra blanks,
+    # which keeps the table at a few MB on the 4x5 board while staying much tighter than Manhattan distance
+    small = [i for i in range(1, len(board.shapes)) if board.shape_area(i) == 1]
+    dropped = set(small[-2:])
+    return [i for i in range(len(board.shapes)) if i not in dropped]
+
+
+class PatternDatabase:
+    def __init__(self, board, pattern=None):
+        self.board = board
+        if pattern is None:
+            pattern = default_pattern(board)
+        if pattern[0] != 0:
+            raise ValueError("the pattern has to start with the target block (piece 0)")
+        self.pattern = list(pattern)
+        self.abstract = Board([board.shapes[i] for i in self.pattern], board.cols, board.rows, board.target)
+        self.size = self.abstract.rank_size
+        # every group of identical pieces with some of them in the pattern, in the order the abstract board ranks its
+        # groups, with every choice of the positions (among the group's sorted cells) of the pieces it keeps
+        group_of = {i: group for group in board.groups for i in group}
+        self.kept = []
+        for abstract_group in self.abstract.rank_groups:
+            group = group_of[self.pattern[abstract_group[0]]]
+            self.kept.append((group, list(combinations(range(len(group)), len(abstract_group)))))
+        # the pieces outside the pattern still have to leave the goal area, with moves the
+        # abstraction never counts, so they are added on top of the table value
+        self.others = [i for group in board.groups if not any(i in self.pattern for i in group) for i in group]
+        self.table = None
+        self.memo = {} #canonical key -> estimate
+
+    def build(self):
+        abstract = self.abstract
+        table = array("B", [UNREACHED]) * self.size
+        queue = deque()
+        for goal in abstract.goal_states():
+            table[abstract.rank(goal)] = 0
+            queue.append((goal, 0))
+        # slides are reversible, so searching forward from the goals gives the distance to the nearest goal
+        while queue:
+            state, distance = queue.popleft()
+            distance = min(distance + 1, UNREACHED - 1)
+            for neighbor in abstract.neighbors(state):
+                index = abstract.rank(neighbor)
+                if table[index] == UNREACHED:
+                    table[index] = distance
+                    queue.append((neighbor, distance))
+        self.table = table
+        return self
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            self.table.tofile(file)
+
+    def load(self, path):
+        table = array("B")
+        with open(path, "rb") as file:
+            table.fromfile(file, self.size)
+        self.table = table
+        return self
+
+    def heuristic(self, state):
+        state_key = self.board.key(state)
+        h = self.memo.get(state_key)
+        if h is None:
+            if len(self.memo) >= MEMO_LIMIT:
+                self.memo.clear()
+            h = self.memo[state_key] = self.estimate(state)
+        return h
+
+    def estimate(self, state):
+        # Board.rank_cells of the abstract board for every choice of the kept pieces at once: a choice is extended
+        # group by group, with its rank so far, the cells it covers and the dropped pieces it found in the goal area
+        board = self.board
+        cells = board.cells_of(state)
+        choose, shape_masks, goal_mask = self.abstract.choose, board.shape_masks, board.goal_mask
+        outside = sum(1 for i in self.others if (shape_masks[i] << cells[i]) & goal_mask)
+        choices = [(0, 0, outside)]
+        for (group, kept), radix in zip(self.kept, self.abstract.rank_radix):
+            mask = shape_masks[group[0]]
+            group_cells = sorted(cells[i] for i in group)
+            in_goal = [1 if (mask << cell) & goal_mask else 0 for cell in group_cells]
+            in_group = sum(in_goal)
+            extended = []
+            for rank, covered, dropped in choices:
+                # the index of every cell among the cells the earlier groups left free, as in rank_cells
+                free = [cell - (covered & ((1 << cell) - 1)).bit_count() for cell in group_cells]
+                for positions in kept:
+                    group_rank = 0
+                    group_covered = covered
+                    dropped_here = in_group
+                    for j, position in enumerate(positions, 1):
+                        group_rank += choose[free[position]][j]
+                        group_covered |= mask << group_cells[position]
+                        dropped_here -= in_goal[position]
+                    extended.append((rank * radix + group_rank, group_covered, dropped + dropped_here))
+            choices = extended
+        table = self.table
+        return max(table[rank] + dropped for rank, _, dropped in choices)
+
+
+def pattern_db_path(database):
+    return cache_path("pattern_db_%s_%s.bin" % (board_signature(database.board), "-".join(map(str, database.pattern))))
+
+
+def pattern_db_saved(board, pattern=None):
+    # whether load_pattern_db reads the table from disk instead of building it, which takes seconds
+    database = PatternDatabase(board, pattern)
+    path = pattern_db_path(database)
+    return os.path.exists(path) and os.path.getsize(path) == database.size
+
+
+def load_pattern_db(board, pattern=None, path=None):
+    # loads the table from disk, or builds and saves it the first time this board and pattern are used
+    database = PatternDatabase(board, pattern)
+    if path is None:
+        path = pattern_db_path(database)
+    if os.path.exists(path) and os.path.getsize(path) == database.size:
+        return database.load(path)
+    database.build()
+    database.save(path)
+    return database
@@ -0,0 +1,72 @@
+# Solutions that were found before, so solving the same position again needs no search.
+#
+# An entry is keyed by the board signature (size, goal and shapes), the kind of solution and the canonical key of the
+# start state (Board.key, so swapping identical pieces hits the same entry). Every optimal solver gives the same
+# length, so they share the kind "optimal". DFS and weighted A* get a kind of their own, which includes the options
+# that change their result. A path is stored as the top-left cells of every piece after every move, "null" when
+# there is no solution. On a hit it is relabelled to the piece indices of the state that was asked for.
+# A bounded LRU of entries sits in front of an sqlite file in the cache directory, shared by all processes.
+import json
+import sqlite3
+from collections import OrderedDict
+
+from klotski.storage import board_signature, cache_path
+
+MISS = object() #returned by lookup when nothing is stored, a stored None means the position has no solution
+OPTIMAL = {"astar", "bfs", "bidirectional", "ida", "table", "parallel", "hda", "external", "numpy"}
+
+
+def solution_kind(algorithm, symmetry=False, weight=1):
+    # the label under which a solver's results are stored. A heuristic passed to the solvers is assumed admissible
+    if algorithm in OPTIMAL and (algorithm != "astar" or weight == 1):
+        return "optimal"
+    if algorithm == "astar":
+        return f"astar-{weight}" + ("-symmetry" if symmetry else "")
+    return algorithm + ("-symmetry" if symmetry else "")
+
+
+class SolutionCache:
+    def __init__(self, path=None, capacity=256):
+        # path: the sqlite file (default: solutions.sqlite in the cache directory), capacity: entries kept in memory
+        self.capacity = capacity
+        self.recent = OrderedDict() #(signature, kind, key) -> list of cell lists or None, least recently used first
+        self.connection = sqlite3.connect(path or cache_path("solutions.sqlite"), timeout=30)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS solutions (signature TEXT, kind TEXT, key TEXT, path TEXT, "
+                                "PRIMARY KEY (signature, kind, key))")
+        self.connection.commit()
+
+    def entry(self, board, state, algorithm, symmetry, weight):
+        return board_signature(board), solution_kind(algorithm, symmetry, weight), format(board.key(state), "x")
+
+    def remember(self, entry, cells):
+        self.recent[entry] = cells
+        self.recent.move_to_end(entry)
+        if len(self.recent) > self.capacity:
+            self.recent.popitem(last=False)
+
+    def lookup(self, board, state, algorithm="astar", symmetry=False, weight=1):
+        # the stored solution from state under state's piece indices, None if it has none, MISS if unknown
+        entry = self.entry(board, state, algorithm, symmetry, weight)
+        if entry in self.recent:
+            cells = self.recent[entry]
+            self.recent.move_to_end(entry)
+        else:
+            row = self.connection.execute("SELECT path FROM solutions WHERE signature = ? AND kind = ? AND key = ?",
+                                          entry).fetchone()
+            if row is None:
+                return MISS
+            cells = json.loads(row[0])
+            self.remember(entry, cells)
+        if cells is None:
+            return None
+        return board.relabel_path([board.pack(step) for step in cells], state)
+
+    def store(self, board, state, solution, algorithm="astar", symmetry=False, weight=1):
+        entry = self.entry(board, state, algorithm, symmetry, weight)
+        cells = None if solution is None else [board.cells_of(step) for step in solution]
+        self.remember(entry, cells)
+        self.connection.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)", entry + (json.dumps(cells),))
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,298 @@
+# BFS, DFS and A* on the bitboard model, plus one entry point that picks any of the solvers by name.
+# Nothing here imports pygame, so the solvers run on a headless machine and can be imported by benchmarks.
+import heapq
+import time
+import tracemalloc
+from collections import deque
+
+from klotski.bidirectional import bidirectional_bfs
+from klotski.compact import CompactMap, CompactSet
+from klotski.distance_table import load_distance_table
+from klotski.ida_star import ida_star
+from klotski.metrics import logger
+from klotski.pattern_db import load_pattern_db
+from klotski.solution_cache import MISS
+
+ALGORITHMS = ["astar", "bfs", "dfs", "bidirectional", "ida", "table", "parallel", "hda", "external", "numpy"]
+
+
+def state_key_function(board, symmetry, compact=False):
+    #canonical key used by the visited sets, with symmetry a state and its mirror share one key.
+    #Compact visited sets use the rank instead, which tells the same states apart in far fewer bits
+    if symmetry and not board.symmetric:
+        raise ValueError("symmetry reduction needs a goal that is symmetric about the vertical centre line")
+    if compact:
+        return board.symmetric_rank if symmetry else board.rank
+    return board.symmetric_key if symmetry else board.key
+
+
+def visited_map(board, compact):
+    #map from canonical key to a small value: a dict, or with compact a CompactMap over the ranks that costs
+    #single-digit bytes per state and only holds ints below 2**16. See klotski/compact.py
+    if compact:
+        return CompactMap(board.rank_size, value_typecode="H")
+    return {}
+
+
+def visited_set(board, compact):
+    #set of canonical keys: a set, or with compact a CompactSet over the ranks
+    if compact:
+        return CompactSet(board.rank_size)
+    return set()
+
+
+def reconstruct_path(board, parents, state, key):
+    #parents maps the canonical key of every reached state to (parent state, (tile index, direction)),
+    #the initial state maps to None. Keys ignore which of two identical tiles is where, but the stored parents are
+    #the exact states that were expanded, so walking back from the goal gives the concrete tile indices for the GUI.
+    #The frontier never swaps a state for its mirror either, so a symmetry reduced path needs no un-mirroring
+    path = []
+    while parents[key(state)] is not None:
+        path.append(state)
+        state = parents[key(state)][0]
+    path.reverse()
+    #HDA* can reach a key again through a cheaper parent after expanding it, so align the tile indices step by step
+    return board.relabel_path(path, state)
+
+
+def reconstruct_moves(board, parents, state, key, initial_state):
+    #reconstruct_path for compact parents, which hold board.move_code + 1 of the slide that reached each key
+    #(0 for the initial state). The codes name cells instead of tiles, so undoing them from the goal gives legal
+    #states under any labelling, and the path is aligned to initial_state's tile indices at the end
+    path = []
+    code = parents[key(state)]
+    while code:
+        path.append(state)
+        state = board.unmove(state, code - 1)
+        code = parents[key(state)]
+    path.reverse()
+    return board.relabel_path(path, initial_state)
+
+
+def bfs_solver(board, initial_state, symmetry=False, metrics=None, compact=False):
+    #Explores all possible state of the puzzle level by level, uses board.moves to create new state to explore, until game wins
+    #it pops the queue from the left, therefore it will only explore level by level.
+    #metrics, when given, is a Metrics the solver counts into (same for the other solvers), see klotski/metrics.py.
+    #compact keeps the visited states in a CompactMap of move codes instead of a dict of parent states
+    key = state_key_function(board, symmetry, compact)
+    queue = deque([initial_state])
+    parents = visited_map(board, compact) #predecessor map by canonical key, also works as the visited set
+    parents[key(initial_state)] = 0 if compact else None
+    depth = 0
+    level_left = 1 #states of the current depth still in the queue
+
+    while queue:
+        current_state = queue.popleft()
+
+        if board.is_goal(current_state):
+            logger.info("Solution found by BFS")
+            if compact:
+                return reconstruct_moves(board, parents, current_state, key, initial_state)
+            return reconstruct_path(board, parents, current_state, key)
+
+        queued = len(queue)
+        moves = board.moves(current_state)
+        for tile, direction, neighbor in moves:
+            neighbor_key = key(neighbor)
+            if neighbor_key not in parents:
+                if compact:
+                    parents[neighbor_key] = board.move_code(neighbor, tile, direction) + 1
+                else:
+                    parents[neighbor_key] = (current_state, (tile, direction))
+                queue.append(neighbor)
+
+        level_left -= 1
+        if level_left == 0:
+            depth += 1
+            level_left = len(queue)
+        if metrics is not None:
+            metrics.update(len(moves), len(queue) - queued, len(queue), depth)
+
+    return None
+
+
+def dfs_solver(board, initial_state, symmetry=False, metrics=None, compact=False):
+    key = state_key_function(board, symmetry, compact)
+    stack = [(initial_state, 0 if compact else None, 0)] #state, (parent state, move) it was pushed from, depth
+    parents = visited_map(board, compact)
+
+    while stack:
+        current_state, parent, depth = stack.pop() # pop the latest state in the stack, which allow dps to dive deeply into a path
+        current_key = key(current_state)
+        if current_key in parents:
+            continue
+
+        parents[current_key] = parent
+
+        if board.is_goal(current_state):
+            logger.info("Solution found by DFS")
+            if compact:
+                return reconstruct_moves(board, parents, current_state, key, initial_state)
+            return reconstruct_path(board, parents, current_state, key)
+        # Generate new states to the stack
+        stacked = len(stack)
+        moves = board.moves(current_state)
+        for tile, direction, neighbor in moves:
+            if key(neighbor) not in parents:
+                if compact:
+                    stack.append((neighbor, board.move_code(neighbor, tile, direction) + 1, depth + 1))
+                else:
+                    stack.append((neighbor, (current_state, (tile, direction)), depth + 1))
+        if metrics is not None:
+            metrics.update(len(moves), len(stack) - stacked, len(stack), depth)
+
+    logger.info("No solution found by DFS")
+    return None
+
+
+def astar_solver(board, initial_state, symmetry=False, weight=1, heuristic=None, metrics=None, compact=False):
+    #weight 1 is optimal A*, a bigger weight trusts the heuristic more and trades optimality for speed
+    #(the old pixel heuristic behaved like weight 100 and returned 53 moves).
+    #Without a heuristic the pattern database of the board is used, built once and cached on disk. See klotski/pattern_db.py
+    #The heuristic has to be consistent as well as admissible, A* closes every state it expands and never re-opens it
+    if heuristic is None:
+        heuristic = load_pattern_db(board).heuristic
+
+    key = state_key_function(board, symmetry, compact)
+    open_set = []
+    heapq.heappush(open_set, (weight * heuristic(initial_state), 0, initial_state)) #f(n), -g(n), current state
+    best_g = visited_map(board, compact) #cheapest known cost of every reached state
+    best_g[key(initial_state)] = 0
+    parents = visited_map(board, compact) #predecessor map, updated whenever a cheaper way to a state is found
+    parents[key(initial_state)] = 0 if compact else None
+    closed = visited_set(board, compact) #expanded states, with a consistent heuristic none is reached cheaper later
+
+    while open_set:
+
+        f, g, current_state = heapq.heappop(open_set) #pop the lowest f(n) state from the open set, deepest first on ties
+        g = -g
+
+        # an entry pushed before a cheaper way to this state was found, which has already been expanded
+        current_key = key(current_state)
+        if current_key in closed:
+            continue
+        closed.add(current_key)
+
+        # Check win
+        if board.is_goal(current_state):
+            if compact:
+                return reconstruct_moves(board, parents, current_state, key, initial_state)
+            return reconstruct_path(board, parents, current_state, key)
+
+        opened = len(open_set)
+        moves = board.moves(current_state)
+        for tile, direction, neighbor in moves:
+            neighbor_key = key(neighbor)
+            # g + 1 for the cost of moving to next state
+            if neighbor_key not in closed and g + 1 < best_g.get(neighbor_key, g + 2):
+                best_g[neighbor_key] = g + 1
+                if compact:
+                    parents[neighbor_key] = board.move_code(neighbor, tile, direction) + 1
+                else:
+                    parents[neighbor_key] = (current_state, (tile, direction))
+                heapq.heappush(open_set, (g + 1 + weight * heuristic(neighbor), -(g + 1), neighbor))
+        if metrics is not None:
+            metrics.update(len(moves), len(open_set) - opened, len(open_set), g)
+
+    return None
+
+
+def solve(board, initial_state, algorithm="astar", symmetry=False, weight=1, table_size=1 << 16, heuristic=None,
+          metrics=None, workers=None, compact=False, memory_budget=64 << 20, temp_dir=None, cache=None,
+          incremental=None):
+    #runs the solver called algorithm (one of ALGORITHMS), returns the list of states after every move or None.
+    #symmetry applies to bfs, dfs, astar, parallel, hda, external and numpy, weight to astar, table_size to ida, heuristic
+    #(default: the pattern database) to astar, ida and hda, workers to parallel and hda, compact to bfs, dfs and astar,
+    #memory_budget (bytes) and temp_dir (default: the system's temporary directory) to external.
+    #metrics is counted into by every solver except table, which expands nothing, and finished when the solver returns.
+    #cache, a SolutionCache, answers positions solved before without searching and stores what the solver finds.
+    #incremental, an IncrementalSolver of this board, replaces astar_solver (weight 1) and reuses earlier solves
+    if cache is not None:
+        cached = cache.lookup(board, initial_state, algorithm, symmetry, weight)
+        if cached is not MISS:
+            if metrics is not None:
+                metrics.finish()
+            return cached
+        solution = solve(board, initial_state, algorithm, symmetry, weight, table_size, heuristic, metrics, workers,
+                         compact, memory_budget, temp_dir, incremental=incremental)
+        cache.store(board, initial_state, solution, algorithm, symmetry, weight)
+        return solution
+    try:
+        if algorithm == "astar" and weight == 1 and incremental is not None:
+            return incremental.solve(initial_state, metrics)
+        if algorithm == "astar":
+            return astar_solver(board, initial_state, symmetry, weight, heuristic, metrics, compact)
+        if algorithm == "bfs":
+            return bfs_solver(board, initial_state, symmetry, metrics, compact)
+        if algorithm == "dfs":
+            return dfs_solver(board, initial_state, symmetry, metrics, compact)
+        if algorithm == "bidirectional":
+            #optimal like BFS, meets a backward search from every goal state
+            return bidirectional_bfs(board, initial_state, metrics)
+        if algorithm == "ida":
+            #optimal, memory capped by the transposition table size
+            if heuristic is None:
+                heuristic = load_pattern_db(board).heuristic
+            return ida_star(board, initial_state, heuristic, table_size, metrics)
+        if algorithm == "table":
+            #walks down a precomputed distance table, built once per board
+            return load_distance_table(board).solve(initial_state)
+        if algorithm == "parallel":
+            #BFS with every level expanded by several processes, imported here since it builds on this module
+            from klotski.parallel_bfs import parallel_bfs
+            return parallel_bfs(board, initial_state, workers, symmetry, metrics)
+        if algorithm == "hda":
+            #optimal A* with the open lists spread over several processes by hash
+            from klotski.hda_star import hda_star
+            return hda_star(board, initial_state, workers, symmetry, heuristic, metrics)
+        if algorithm == "external":
+            #BFS with its levels in sorted files on disk, for searches bigger than memory
+            from klotski.external_bfs import external_bfs
+            return external_bfs(board, initial_state, symmetry, metrics, memory_budget, temp_dir)
+        if algorithm == "numpy":
+            #BFS with whole levels expanded by NumPy, which is only needed (and imported) for this one
+            from klotski.numpy_bfs import numpy_bfs
+            return numpy_bfs(board, initial_state, symmetry, metrics)
+        raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
+    finally:
+        if metrics is not None:
+            metrics.finish()
+
+
+def hint(board, initial_state):
+    #the best next move as (tile index, direction, new state), None when solved or unsolvable. Looked up in the
+    #distance table (built and saved on first use), so it takes milliseconds and no search
+    table = load_distance_table(board)
+    try:
+        return table.hint(initial_state)
+    finally:
+        table.close()
+
+
+def measured_solve(board, initial_state, algorithm="astar", trace_memory=True, **options):
+    #solve with the time and peak traced memory the scripts report, returns (solution, seconds, peak bytes).
+    #tracemalloc slows the solvers down several times, without trace_memory the peak is 0
+    if trace_memory:
+        tracemalloc.start()
+    start_time = time.time()
+    try:
+        solution = solve(board, initial_state, algorithm, **options)
+    finally:
+        end_time = time.time()
+        peak = 0
+        if trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return solution, end_time - start_time, peak
+
+
+def report(solution, seconds, peak=None):
+    #peak is None when memory was not traced
+    if solution is not None:
+        print("Solution found!")
+        print(f"Time taken: {seconds:.4f} seconds")
+        print(f"Move count: {len(solution)}")
+        if peak is not None:
+            print(f"Peak memory usage: {peak / 1024 / 1024:.4f} MB")
+    else:
+        print("No solution found.")
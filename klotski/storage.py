@@ -0,0 +1,16 @@
+# Where the solver keeps the tables it builds once and reuses between runs.
+import hashlib
+import os
+
+CACHE_DIR = os.environ.get("KLOTSKI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "klotski"))
+
+
+def board_signature(board):
+    # board size, goal and piece shapes, i.e. everything a precomputed table depends on
+    description = repr((board.cols, board.rows, board.target, board.shapes))
+    return hashlib.sha1(description.encode("ascii")).hexdigest()[:16]
+
+
+def cache_path(name):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, name)
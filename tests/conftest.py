@@ -0,0 +1,15 @@
+# Shared setup of the tests, run with python -m pytest.
+# The solvers build their tables in a temporary cache directory, so the first run takes a little while.
+import pytest
+
+from klotski import storage
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory):
+    #keeps the tables the tests build out of the user's cache
+    with pytest.MonkeyPatch.context() as patch:
+        directory = tmp_path_factory.mktemp("klotski-cache")
+        patch.setenv("KLOTSKI_CACHE_DIR", str(directory))
+        patch.setattr(storage, "CACHE_DIR", str(directory))
+        yield directory
@@ -0,0 +1,31 @@
+# Layouts and checks the test modules share.
+from collections import deque
+
+from klotski.layouts import LAYOUTS
+
+# the classic layout with a horizontal 2x1 block, a shape the two bundled layouts do not have
+HORIZONTAL = [(1, 0, 2, 2), (0, 0, 1, 2), (3, 0, 1, 2), (0, 2, 1, 2), (3, 2, 1, 2), (1, 2, 2, 1), (1, 3, 1, 1),
+              (2, 3, 1, 1), (0, 4, 1, 1), (3, 4, 1, 1)]
+BOARDS = [LAYOUTS["standard"], LAYOUTS["variant"], HORIZONTAL]
+
+
+def reachable(board, initial_state, limit=2000):
+    #the first limit states a breadth first walk from initial_state reaches
+    seen = {board.key(initial_state)}
+    queue = deque([initial_state])
+    states = []
+    while queue and len(states) < limit:
+        state = queue.popleft()
+        states.append(state)
+        for neighbor in board.neighbors(state):
+            if board.key(neighbor) not in seen:
+                seen.add(board.key(neighbor))
+                queue.append(neighbor)
+    return states
+
+
+def check_path(board, initial_state, path):
+    #every state is one legal slide from the one before, and the last one is a goal
+    assert board.is_goal(path[-1])
+    for before, after in zip([initial_state] + path, path):
+        assert after in board.neighbors(before)
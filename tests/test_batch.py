@@ -0,0 +1,66 @@
+# klotski-batch: reading configurations and solving them on a process pool.
+import csv
+import json
+
+from klotski.batch import main, read_jobs, run_batch
+from klotski.layouts import LAYOUTS, TARGET
+
+CONFIGURATIONS = [
+    {"id": "standard", "variant": "standard", "algorithm": "table"},
+    {"id": "layout", "layout": [list(block) for block in LAYOUTS["variant"]], "algorithm": "bfs"},
+    {"id": "text", "layout": [[1, 0, 2, 2], [0, 0, "1", 2]]},
+    {"id": "case", "variant": "Standard"},
+    {"id": "target", "layout": [[0, 0, 2, 2]], "target": [3, 3]},
+    {"id": "algorithm", "algorithm": "quick"},
+]
+
+
+def write_lines(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows) + "not json\n")
+    return str(path)
+
+
+def test_read_jobs_checks_every_configuration(tmp_path):
+    jobs = {job["id"]: job for job in read_jobs(write_lines(tmp_path / "jobs.jsonl", CONFIGURATIONS))}
+    assert jobs["standard"]["layout"] == LAYOUTS["standard"] and jobs["standard"]["target"] == TARGET
+    assert jobs["layout"]["algorithm"] == "bfs" and "error" not in jobs["layout"]
+    assert "not four ints" in jobs["text"]["error"]
+    assert "unknown variant" in jobs["case"]["error"]
+    assert "cannot reach" in jobs["target"]["error"]
+    assert "unknown algorithm" in jobs["algorithm"]["error"]
+    assert jobs["7"]["error"] #the line that is not JSON, named by its line number
+
+
+def test_read_jobs_csv(tmp_path):
+    path = tmp_path / "jobs.csv"
+    path.write_text("id,variant,layout,algorithm,target\n"
+                    "a,variant,,table,\n"
+                    "b,,1 0 2 2;0 0 1 2,,1 3\n"
+                    "c,,1 0 2 2;0 0 x 2,,\n")
+    jobs = {job["id"]: job for job in read_jobs(str(path), "bfs")}
+    assert jobs["a"]["layout"] == LAYOUTS["variant"] and jobs["a"]["algorithm"] == "table"
+    assert jobs["b"]["layout"] == [(1, 0, 2, 2), (0, 0, 1, 2)] and jobs["b"]["algorithm"] == "bfs"
+    assert jobs["b"]["target"] == (1, 3)
+    assert "error" in jobs["c"]
+
+
+def test_run_batch_writes_a_row_per_configuration(tmp_path):
+    output = tmp_path / "results.csv"
+    jobs = list(read_jobs(write_lines(tmp_path / "jobs.jsonl", CONFIGURATIONS)))
+    failed = run_batch(jobs, str(output), workers=2, trace_memory=False)
+    with open(output, newline="") as file:
+        rows = {row["id"]: row for row in csv.DictReader(file)}
+    assert set(rows) == {job["id"] for job in jobs}
+    assert rows["standard"]["moves"] == "45" and rows["standard"]["error"] == ""
+    assert rows["layout"]["moves"] == "45" and rows["layout"]["error"] == ""
+    assert failed == len(jobs) - 2
+    assert all(rows[name]["error"] for name in ("text", "case", "target", "algorithm", "7"))
+
+
+def test_main_exit_status(tmp_path, capsys):
+    good = tmp_path / "good.jsonl"
+    good.write_text(json.dumps(CONFIGURATIONS[0]) + "\n")
+    assert main([str(good), str(tmp_path / "good.out"), "--workers", "1", "--no-memory"]) == 0
+    assert "1 of 1 configurations solved" in capsys.readouterr().out
+    bad = write_lines(tmp_path / "bad.jsonl", CONFIGURATIONS)
+    assert main([bad, str(tmp_path / "bad.out"), "--workers", "1", "--no-memory"]) == 1
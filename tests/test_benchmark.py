@@ -0,0 +1,50 @@
+# klotski-benchmark: runs in fresh processes, summary rows and failed runs.
+import csv
+import subprocess
+
+from klotski import benchmark as benchmark_module
+from klotski.benchmark import HEADER, benchmark, default_algorithms, single_run
+from klotski.solvers import ALGORITHMS
+
+
+def read_rows(path):
+    with open(path, newline="") as file:
+        return [row for row in csv.reader(file) if any(row)]
+
+
+def test_default_algorithms():
+    algorithms = default_algorithms()
+    assert [algorithm for algorithm in ALGORITHMS if algorithm != "numpy"] == \
+        [algorithm for algorithm in algorithms if algorithm != "numpy"]
+
+
+def test_default_algorithms_without_numpy(monkeypatch):
+    monkeypatch.setattr(benchmark_module.importlib.util, "find_spec", lambda name: None)
+    assert "numpy" not in default_algorithms()
+
+
+def test_single_run():
+    run = single_run("standard", "bfs", trace_memory=False)
+    assert run["moves"] == 45 and run["expanded"] > 0 and run["peak_mb"] == 0
+
+
+def test_benchmark_writes_runs_and_summaries(tmp_path):
+    output = tmp_path / "Data.csv"
+    benchmark(["standard"], ["table"], 2, str(output), trace_memory=False)
+    rows = read_rows(output)
+    assert rows[0] == HEADER
+    assert [row[0] for row in rows[1:]] == ["Distance table (Standard)"] * 2 + ["Mean", "Median", "Stddev", "Min"]
+    assert all(row[3] == "45" and row[2] == "" for row in rows[1:3]) #no Peak Memory without the traced runs
+    assert rows[3][3] == "45"
+
+
+def test_failed_run_is_an_error_row(tmp_path, monkeypatch, capsys):
+    def failing(variant, algorithm, trace_memory=True, timeout=None):
+        raise subprocess.CalledProcessError(1, "cmd", stderr="Traceback\nModuleNotFoundError: boom\n")
+
+    monkeypatch.setattr(benchmark_module, "run_in_subprocess", failing)
+    output = tmp_path / "Data.csv"
+    benchmark(["standard"], ["bfs"], 2, str(output))
+    rows = read_rows(output)
+    assert rows[1:] == [["BFS (Standard)", "error", "", "", ""]] * 2 #and no summary rows of nothing
+    assert "ModuleNotFoundError: boom" in capsys.readouterr().err
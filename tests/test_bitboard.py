@@ -0,0 +1,52 @@
+# Move generation and perfect ranking of the bitboard model.
+import random
+
+import pytest
+
+from helpers import BOARDS, reachable
+from klotski.bitboard import DIRECTIONS
+from klotski.layouts import check_layout, make_board
+
+
+def brute_force_moves(board, state):
+    #every one cell slide found by moving each piece each way and checking the board cell by cell
+    positions = board.positions(state)
+    occupied = {}
+    for i, ((col, row), (width, height)) in enumerate(zip(positions, board.shapes)):
+        for c in range(col, col + width):
+            for r in range(row, row + height):
+                occupied[c, r] = i
+    moves = set()
+    for i, ((col, row), (width, height)) in enumerate(zip(positions, board.shapes)):
+        for direction, (dx, dy) in enumerate(DIRECTIONS):
+            new_col, new_row = col + dx, row + dy
+            if new_col < 0 or new_row < 0 or new_col + width > board.cols or new_row + height > board.rows:
+                continue
+            cells = [(c, r) for c in range(new_col, new_col + width) for r in range(new_row, new_row + height)]
+            if all(occupied.get(cell, i) == i for cell in cells):
+                moved = list(positions)
+                moved[i] = (new_col, new_row)
+                moves.add((i, direction, board.encode(moved)))
+    return moves
+
+
+@pytest.mark.parametrize("layout", BOARDS)
+def test_moves_match_brute_force(layout):
+    check_layout(layout)
+    board, initial_state = make_board(layout)
+    for state in reachable(board, initial_state):
+        moves = board.moves(state)
+        assert len(moves) == len(set(moves))
+        assert set(moves) == brute_force_moves(board, state)
+
+
+@pytest.mark.parametrize("layout", BOARDS)
+def test_rank_round_trip(layout):
+    board, initial_state = make_board(layout)
+    for state in reachable(board, initial_state):
+        rank = board.rank(state)
+        assert 0 <= rank < board.rank_size
+        #unrank picks one labelling of identical pieces, so the state comes back up to that labelling
+        assert board.key(board.unrank(rank)) == board.key(state)
+    for rank in random.Random(0).sample(range(board.rank_size), 1000):
+        assert board.rank(board.unrank(rank)) == rank
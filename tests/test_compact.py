@@ -0,0 +1,55 @@
+# The array-backed visited tables and the solvers that use them.
+import random
+
+import pytest
+
+from helpers import check_path
+from klotski.compact import CompactMap, CompactSet
+from klotski.layouts import LAYOUTS, make_board
+from klotski.metrics import Metrics
+from klotski.solvers import solve
+
+
+def test_compact_map_across_grow():
+    table = CompactMap(1 << 20, capacity=4)
+    values = {key: key % 65536 for key in random.Random(0).sample(range(1 << 20), 5000)}
+    sizes = set()
+    for key, value in values.items():
+        table[key] = value
+        sizes.add(table.size)
+    assert len(sizes) > 5 #the table grew several times while it was filled
+    assert len(table) == len(values)
+    assert sorted(table) == sorted(values)
+    for key, value in values.items():
+        assert key in table
+        assert table[key] == value
+    absent = [key for key in range(1000) if key not in values]
+    assert all(key not in table and table.get(key) is None for key in absent)
+    table[absent[0]] = 7 #new keys still go in after growing
+    assert table[absent[0]] == 7 and len(table) == len(values) + 1
+
+
+def test_compact_set_across_grow():
+    table = CompactSet(1 << 20, capacity=4)
+    keys = random.Random(1).sample(range(1 << 20), 3000)
+    for key in keys:
+        table.add(key)
+        table.add(key) #a second add changes nothing
+    assert len(table) == len(keys)
+    assert sorted(table) == sorted(keys)
+    assert all(key in table for key in keys)
+
+
+@pytest.mark.parametrize("symmetry", [False, True])
+@pytest.mark.parametrize("algorithm", ["bfs", "dfs", "astar"])
+def test_compact_solvers_match_the_dict_solvers(algorithm, symmetry):
+    board, initial_state = make_board(LAYOUTS["variant"])
+    plain, compact = Metrics(), Metrics()
+    expected = solve(board, initial_state, algorithm, symmetry=symmetry, metrics=plain)
+    path = solve(board, initial_state, algorithm, symmetry=symmetry, compact=True, metrics=compact)
+    check_path(board, initial_state, path)
+    #the same search over ranks instead of keys, only where the parents are stored differs
+    assert len(path) == len(expected)
+    assert compact.expanded == plain.expanded
+    if algorithm != "dfs":
+        assert len(path) == 45
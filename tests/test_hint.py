@@ -0,0 +1,20 @@
+# hint(): following the hinted moves solves the puzzle in the fewest moves.
+import pytest
+
+from klotski.layouts import LAYOUTS, make_board
+from klotski.solvers import hint
+
+
+@pytest.mark.parametrize("variant", sorted(LAYOUTS))
+def test_hints_reach_the_goal_optimally(variant):
+    board, state = make_board(LAYOUTS[variant])
+    moves = 0
+    move = hint(board, state)
+    while move is not None:
+        tile, direction, new_state = move
+        assert (tile, direction, new_state) in list(board.moves(state)) #a legal slide of the named piece
+        state = new_state
+        moves += 1
+        assert moves <= 45
+        move = hint(board, state)
+    assert board.is_goal(state) and moves == 45 #and once solved there is nothing to hint
@@ -0,0 +1,45 @@
+# IncrementalSolver: as short as a fresh A* however much it has stored, and the expansion limit.
+import random
+
+from klotski.incremental import IncrementalSolver
+from klotski.layouts import LAYOUTS, make_board
+from klotski.metrics import Metrics
+from klotski.pattern_db import load_pattern_db
+from klotski.solvers import astar_solver
+
+from helpers import check_path, reachable
+
+
+def test_same_length_as_astar():
+    board, initial_state = make_board(LAYOUTS["standard"])
+    heuristic = load_pattern_db(board).heuristic
+    solver = IncrementalSolver(board, heuristic)
+    first = solver.solve(initial_state)
+    check_path(board, initial_state, first)
+    assert len(first) == 45
+    #positions off the stored path, each search ending on it or at a goal, then adding its own path
+    states = random.Random(0).sample(reachable(board, initial_state), 8) + random.Random(1).sample(first, 4)
+    for state in states:
+        path = solver.solve(state)
+        check_path(board, state, path)
+        assert len(path) == len(astar_solver(board, state, heuristic=heuristic))
+
+
+def test_known_positions_need_no_search():
+    board, initial_state = make_board(LAYOUTS["standard"])
+    solver = IncrementalSolver(board, load_pattern_db(board).heuristic)
+    path = solver.solve(initial_state)
+    assert solver.known(path[10]) and solver.ready(path[10])
+    metrics = Metrics()
+    assert solver.solve(path[10], metrics=metrics, limit=0) == path[11:]
+    assert metrics.expanded == 0
+
+
+def test_limit():
+    board, initial_state = make_board(LAYOUTS["standard"])
+    solver = IncrementalSolver(board, load_pattern_db(board).heuristic)
+    assert not solver.known(initial_state)
+    assert solver.solve(initial_state, limit=0) is None #unknown and not a goal, so it needs at least one expansion
+    assert solver.solve(initial_state, limit=10) is None
+    assert not solver.known(initial_state) #an unfinished search stores nothing
+    assert len(solver.solve(initial_state)) == 45
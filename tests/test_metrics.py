@@ -0,0 +1,58 @@
+# Search counters and their throttled reports.
+import logging
+
+from klotski import metrics as metrics_module
+from klotski.layouts import LAYOUTS, make_board
+from klotski.metrics import CHECK_EVERY, Metrics
+from klotski.solvers import solve
+
+
+def test_counters():
+    metrics = Metrics()
+    metrics.update(4, 3, 10, 1)
+    metrics.update(2, 0, 7, 3)
+    metrics.update(6, 6, 12, 2, expanded=5) #one level of a level-synchronous solver
+    assert metrics.expanded == 7
+    assert metrics.generated == 12
+    assert metrics.duplicates == 3
+    assert metrics.max_frontier == 12
+    assert metrics.depth == 3
+    assert metrics.branching_factor == 12 / 7
+
+
+def test_reports_are_throttled():
+    reports = []
+    slow = Metrics(lambda metrics: reports.append(metrics.expanded), interval=3600)
+    for _ in range(5 * CHECK_EVERY):
+        slow.update(1, 1, 1, 1)
+    assert reports == [] #the interval has not passed
+    slow.finish()
+    assert reports == [5 * CHECK_EVERY]
+
+    reports = []
+    fast = Metrics(lambda metrics: reports.append(metrics.expanded), interval=0)
+    for _ in range(3 * CHECK_EVERY + 10):
+        fast.update(1, 1, 1, 1)
+    #the clock is only read every CHECK_EVERY updates, however short the interval
+    assert reports == [CHECK_EVERY, 2 * CHECK_EVERY, 3 * CHECK_EVERY]
+    fast.finish()
+    assert reports[-1] == 3 * CHECK_EVERY + 10
+
+
+def test_solvers_count_into_metrics():
+    board, initial_state = make_board(LAYOUTS["standard"])
+    reports = []
+    metrics = Metrics(reports.append, interval=3600)
+    path = solve(board, initial_state, "bfs", metrics=metrics)
+    assert metrics.finished is not None and reports == [metrics] #solve finishes the metrics
+    assert metrics.depth == len(path) #the deepest level reached is the goal's
+    assert 0 < metrics.expanded <= metrics.generated
+    assert metrics.duplicates < metrics.generated
+
+
+def test_default_report_logs(caplog):
+    metrics = Metrics(metrics_module.log_metrics)
+    metrics.update(2, 1, 1, 1)
+    with caplog.at_level(logging.INFO, logger="klotski"):
+        metrics.finish()
+    assert "expanded 1" in caplog.text
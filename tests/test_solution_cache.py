@@ -0,0 +1,46 @@
+# The solution cache: hits across layouts that differ only in piece order, misses and the in-memory LRU.
+from klotski.layouts import LAYOUTS, make_board
+from klotski.solution_cache import MISS, SolutionCache
+from klotski.solvers import solve
+
+from helpers import check_path
+
+
+def test_hit_is_relabelled_to_the_other_layout(tmp_path):
+    board, initial_state = make_board(LAYOUTS["standard"])
+    other_board, other_state = make_board(LAYOUTS["variant"])
+    assert other_state != initial_state and other_board.key(other_state) == board.key(initial_state)
+    path = solve(board, initial_state, "bfs")
+    cache = SolutionCache(tmp_path / "solutions.sqlite")
+    cache.store(board, initial_state, path, "bfs")
+
+    cached = cache.lookup(other_board, other_state, "astar") #every optimal solver shares an entry
+    assert len(cached) == len(path) and cached != path
+    check_path(other_board, other_state, cached) #the small pieces carry the variant's indices
+
+    reopened = SolutionCache(tmp_path / "solutions.sqlite") #the same again from the sqlite file
+    check_path(other_board, other_state, reopened.lookup(other_board, other_state, "table"))
+    cache.close()
+    reopened.close()
+
+
+def test_miss_and_stored_none(tmp_path):
+    board, initial_state = make_board(LAYOUTS["standard"])
+    cache = SolutionCache(tmp_path / "solutions.sqlite")
+    assert cache.lookup(board, initial_state) is MISS
+    cache.store(board, initial_state, None, "dfs")
+    assert cache.lookup(board, initial_state, "dfs") is None #known to have no solution
+    assert cache.lookup(board, initial_state) is MISS #dfs results are not optimal ones
+    cache.close()
+
+
+def test_lru_keeps_capacity_entries(tmp_path):
+    board, initial_state = make_board(LAYOUTS["standard"])
+    states = [initial_state] + board.neighbors(initial_state)
+    cache = SolutionCache(tmp_path / "solutions.sqlite", capacity=2)
+    for state in states:
+        cache.store(board, state, [state], "bfs")
+    assert len(cache.recent) == 2
+    assert cache.lookup(board, states[0], "bfs") == [states[0]] #evicted, read back from sqlite
+    assert list(cache.recent)[-1] == cache.entry(board, states[0], "bfs", False, 1)
+    cache.close()
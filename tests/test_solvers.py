@@ -0,0 +1,48 @@
+# Every solver on the bundled layouts.
+import pytest
+
+from helpers import check_path, reachable
+from klotski.layouts import LAYOUTS, make_board
+from klotski.metrics import Metrics
+from klotski.solution_cache import OPTIMAL
+from klotski.solvers import ALGORITHMS, solve
+
+
+@pytest.mark.parametrize("variant", sorted(LAYOUTS))
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_solvers_find_a_path(algorithm, variant):
+    if algorithm == "numpy":
+        pytest.importorskip("numpy")
+    board, initial_state = make_board(LAYOUTS[variant])
+    path = solve(board, initial_state, algorithm, workers=2)
+    check_path(board, initial_state, path)
+    if algorithm in OPTIMAL:
+        assert len(path) == 45
+
+
+@pytest.mark.parametrize("algorithm", ["bfs", "dfs", "astar", "parallel", "hda", "external", "numpy"])
+def test_symmetry_keeps_paths_valid_and_optimal(algorithm):
+    if algorithm == "numpy":
+        pytest.importorskip("numpy")
+    board, initial_state = make_board(LAYOUTS["standard"])
+    path = solve(board, initial_state, algorithm, symmetry=True, workers=2)
+    check_path(board, initial_state, path)
+    if algorithm in OPTIMAL:
+        assert len(path) == 45
+
+
+def test_symmetry_merges_mirror_states():
+    board, initial_state = make_board(LAYOUTS["standard"])
+    for state in reachable(board, initial_state, 500):
+        assert board.symmetric_key(state) == board.symmetric_key(board.mirror(state))
+        assert board.symmetric_key(state) == min(board.key(state), board.key(board.mirror(state)))
+    plain, reduced = Metrics(), Metrics()
+    solve(board, initial_state, "bfs", metrics=plain)
+    solve(board, initial_state, "bfs", symmetry=True, metrics=reduced)
+    assert reduced.expanded < plain.expanded
+
+
+def test_symmetry_needs_a_symmetric_goal():
+    board, initial_state = make_board(LAYOUTS["standard"], target=(0, 3))
+    with pytest.raises(ValueError):
+        solve(board, initial_state, "bfs", symmetry=True)